@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Check that modules shared between skills are identical in every skill.
+
+Skills are installed independently, so a helper used by several of them
+(e.g. proc_trace.py) is committed once per skill. Each copy carries a
+"# shared-module:" line; this script groups marked scripts by file name across
+skills/*/scripts/ and fails when the copies of a module differ.
+
+Usage:
+    python scripts/check_shared_modules.py
+    python scripts/check_shared_modules.py --skills-dir ./skills --json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+MARKER = "# shared-module:"
+DEFAULT_SKILLS_DIR = Path(__file__).resolve().parent.parent / "skills"
+
+
+def shared_modules(skills_dir: Path) -> Dict[str, List[Path]]:
+    """{file name: [copies]} for scripts that carry the shared-module marker."""
+    modules: Dict[str, List[Path]] = {}
+    for script in sorted(skills_dir.glob("*/scripts/*.py")):
+        lines = script.read_text(errors="replace").splitlines()
+        if any(line.startswith(MARKER) for line in lines):
+            modules.setdefault(script.name, []).append(script)
+    return modules
+
+
+def check(skills_dir: Path) -> List[dict]:
+    """One entry per shared module: its copies, their digests and whether they match."""
+    results = []
+    for name, copies in sorted(shared_modules(skills_dir).items()):
+        digests = {str(p.relative_to(skills_dir)): hashlib.sha256(p.read_bytes()).hexdigest()
+                   for p in copies}
+        results.append({
+            "module": name,
+            "copies": digests,
+            "in_sync": len(set(digests.values())) == 1,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that shared skill modules are identical")
+    parser.add_argument(
+        "--skills-dir",
+        default=str(DEFAULT_SKILLS_DIR),
+        help=f"Directory of skills (default: {DEFAULT_SKILLS_DIR})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    results = check(Path(args.skills_dir))
+    failed = [r for r in results if not r["in_sync"]]
+    if args.json_output:
+        print(json.dumps(results, indent=2))
+        return 1 if failed else 0
+
+    for result in results:
+        status = "[OK]" if result["in_sync"] else "[DIFFERS]"
+        print(f"{status} {result['module']} ({len(result['copies'])} copies)")
+        if not result["in_sync"]:
+            for path, digest in result["copies"].items():
+                print(f"  {digest[:12]}  {path}")
+    if failed:
+        print("Copy the updated module to every skill that ships it.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Analyze captured activity/conversion event dumps offline.
+
+Streams NDJSON event dumps (e.g. from the awsp-adp-activity stream) or raw pixel
+request lines (query strings, URLs, `kubectl logs` output), plain or gzipped, and
+validates each event against the required fields per event type from
+references/event-types.md. Failures are aggregated by network, event type and field.
+
+Input is read in fixed-size line batches that are validated in worker processes,
+so memory stays bounded by (workers x batch size) regardless of dump size.
+Each NDJSON batch is decoded with one json.loads call and validated column by
+column (one pass per checked field), so validation adds about 10% on top of
+JSON decoding: roughly 50 MB/s of NDJSON per worker, i.e. a multi-GB dump
+still takes minutes per core.
+
+Required fields come from references/event-types.md for client-side events;
+for server-side events they are the analyzer's own heuristics (flagged in the
+report).
+
+Usage:
+    python analyze_events.py dump.ndjson.gz
+    kubectl logs -l app=emission -n adp | python analyze_events.py - --format query
+    python analyze_events.py dump1.gz dump2.gz --network 1746213 --event purchased
+    python analyze_events.py dump.ndjson --samples 3 --json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+# Required fields per event type (references/event-types.md).
+# "actgid" is satisfied by either actgid or actid (debugging-guide.md, 2.3).
+EVENT_REQUIREMENTS: Dict[str, List[str]] = {
+    "page_view": ["actgid", "network"],
+    "product_detail": ["actgid", "network", "products"],
+    "add_to_cart": ["actgid", "network", "products"],
+    "remove_from_cart": ["actgid", "network", "products"],
+    "checkout_started": ["actgid", "network"],
+    "purchased": ["actgid", "network", "cost", "ord"],
+    "lead": ["actgid", "network"],
+    "signup": ["actgid", "network"],
+}
+
+# Server-side event types have no documented required fields (event-types.md lists
+# only their source, and the event models are not part of this toolkit). These are
+# the analyzer's own minimal checks; their failures are flagged as heuristic.
+HEURISTIC_REQUIREMENTS: Dict[str, List[str]] = {
+    "conversion": ["network"],
+    "potential_conversion": ["actgid", "network"],
+    "offer_conversion": ["network"],
+}
+
+# Attribution values of conversion_type (field-reference.md, event-types.md).
+# Heuristic: a record without an event field that carries one is taken as a conversion.
+ATTRIBUTION_TYPES = {"full", "fallback", "none", "full_conversion", "fallback_conversion", "no_conversion"}
+
+# Event field names (Kinesis/DataLake records) -> pixel query parameter names
+FIELD_ALIASES = {
+    "activity_group_id": "actgid",
+    "activity_id": "actid",
+    "event_type": "event",
+    "order_id": "ord",
+    "quantity": "qty",
+    "document_url": "du",
+    "referrer": "dr",
+    "external_ids": "extids",
+    "network_id": "network",
+}
+
+# Query parameter name -> event field name, for reading a column from either
+EVENT_FIELD_NAMES = {param: field for field, param in FIELD_ALIASES.items()}
+
+# Keys that may hold the actual event inside a capture record
+WRAPPERS = ("data", "event", "payload")
+
+NUMERIC_FIELDS = ("cost", "tax", "revenue")
+INTEGER_FIELDS = ("qty",)
+
+FORMATS = ["auto", "ndjson", "query"]
+
+# Pixel endpoint: /<network>/activity (optionally behind scheme and host)
+ACTIVITY_PATH = re.compile(r"/([^/]+)/activity/?$")
+# Parameters that identify a bare query string or other request as an activity event
+EVENT_KEYS = ("actgid", "actid", "event")
+
+
+# === Parsing ===
+
+def parse_query_line(line: str) -> Optional[Dict[str, str]]:
+    """Extract parameters from a raw request line, URL or bare query string.
+
+    Only activity requests count: a /<network>/activity path or parameters that
+    identify an event. Anything else (health checks, other endpoints) is None.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    qpos = line.find("?")
+    path = ""
+    if qpos != -1:
+        # Take the request token around '?' (log lines carry other text around it)
+        start = line.rfind(" ", 0, qpos) + 1
+        end = line.find(" ", qpos)
+        path = line[start:qpos]
+        query = line[qpos + 1:] if end == -1 else line[qpos + 1:end]
+    elif "=" in line and " " not in line:
+        query = line
+    else:
+        return None
+    params = dict(parse_qsl(query, keep_blank_values=True))
+    activity = ACTIVITY_PATH.search(path)
+    if activity is None and not any(key in params for key in EVENT_KEYS):
+        return None
+    if activity and "network" not in params:
+        params["network"] = activity.group(1)
+    return params
+
+
+def unwrap_record(record) -> Optional[dict]:
+    """The event dict of a decoded NDJSON record (Kinesis/Firehose captures often wrap it)."""
+    if not isinstance(record, dict):
+        return None
+    for wrapper in WRAPPERS:
+        inner = record.get(wrapper)
+        if isinstance(inner, dict):
+            return inner
+    return record
+
+
+def parse_json_line(line) -> Optional[dict]:
+    """Parse one NDJSON record (str or bytes) into its event dict."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    try:
+        return unwrap_record(json.loads(line))
+    except ValueError:
+        return None
+
+
+def parse_json_lines(lines: List[bytes]) -> List[Optional[dict]]:
+    """Parse a batch of NDJSON lines, decoding them as one JSON array when possible.
+
+    A batch with any malformed line falls back to parsing line by line.
+    """
+    if all(line[:1] == b"{" and line[-1:] == b"}" for line in lines):
+        try:
+            records = json.loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            records = None
+        if records is not None and len(records) == len(lines):
+            records = [r if r.__class__ is dict else None for r in records]
+            keys = set().union(*filter(None, records))
+            if not keys.intersection(WRAPPERS):
+                return records
+            return [unwrap_record(record) for record in records]
+    return [parse_json_line(line) for line in lines]
+
+
+def is_present(value) -> bool:
+    return value is not None and value != "" and value != [] and value != {}
+
+
+def conversion_event(conversion_type) -> Optional[str]:
+    """Event type implied by conversion_type when a record has no event field."""
+    if not isinstance(conversion_type, str):
+        return None
+    if conversion_type in EVENT_REQUIREMENTS or conversion_type in HEURISTIC_REQUIREMENTS:
+        return conversion_type
+    if conversion_type in ATTRIBUTION_TYPES:
+        return "conversion"
+    return None
+
+
+class Columns:
+    """Column view of a batch of events, by query parameter name (event field names too)."""
+
+    def __init__(self, events: List[dict]):
+        self.events = events
+        self.keys = set().union(*events)
+        self._cache: Dict[str, list] = {}
+
+    def _get(self, name: str) -> Optional[list]:
+        if name not in self.keys:
+            return None
+        return [e.get(name) for e in self.events]
+
+    def __getitem__(self, name: str) -> list:
+        if name not in self._cache:
+            values = self._get(name)
+            other = self._get(EVENT_FIELD_NAMES.get(name, ""))
+            if values is None or other is None:
+                values = values or other or [None] * len(self.events)
+            else:
+                # The event field name wins when a record has both
+                values = [o if o is not None else v for v, o in zip(values, other)]
+            self._cache[name] = values
+        return self._cache[name]
+
+
+def validate_batch(events: List[dict]) -> Tuple[List[str], List[str], List[Tuple[int, str, str]]]:
+    """Validate a batch column by column.
+
+    Returns (networks, event_types, [(index, field, reason), ...]) where each
+    failure points at events[index]. Each check is one pass over one column, so
+    the per-event Python work is a handful of list lookups.
+    """
+    columns = Columns(events)
+    networks = [str(v or "-") for v in columns["network"]]
+    event_types = [str(e or conversion_event(c) or "-")
+                   for e, c in zip(columns["event"], columns["conversion_type"])]
+    failures: List[Tuple[int, str, str]] = []
+
+    by_type: Dict[str, List[int]] = {}
+    for i, event_type in enumerate(event_types):
+        by_type.setdefault(event_type, []).append(i)
+
+    for event_type, rows in by_type.items():
+        required = EVENT_REQUIREMENTS.get(event_type) or HEURISTIC_REQUIREMENTS.get(event_type)
+        if required is None:
+            reason = "missing" if event_type == "-" else "unknown_type"
+            failures.extend((i, "event", reason) for i in rows)
+            required = ["actgid", "network"]
+        for field in required:
+            if field == "actgid":
+                actgid, actid = columns["actgid"], columns["actid"]
+                missing = [i for i in rows if not (is_present(actgid[i]) or is_present(actid[i]))]
+            else:
+                values = columns[field]
+                missing = [i for i in rows if not is_present(values[i])]
+            failures.extend((i, field, "missing") for i in missing)
+
+    for fields, convert, reason in ((NUMERIC_FIELDS, float, "not_numeric"),
+                                    (INTEGER_FIELDS, int, "not_integer")):
+        native = (int, float) if convert is float else int
+        for field in fields:
+            values = columns[field]
+            for i in [i for i, v in enumerate(values) if v is not None and not isinstance(v, native)]:
+                if is_present(values[i]):
+                    try:
+                        convert(values[i])
+                    except (TypeError, ValueError):
+                        failures.append((i, field, reason))
+
+    products = columns["products"]
+    for i in [i for i, v in enumerate(products) if v is not None and not isinstance(v, list)]:
+        value = products[i]
+        if not is_present(value):
+            continue
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                failures.append((i, "products", "invalid_json"))
+                continue
+        if is_present(value) and not isinstance(value, list):
+            failures.append((i, "products", "not_array"))
+
+    failures.sort(key=lambda f: f[0])
+    return networks, event_types, failures
+
+
+def validate(event: dict) -> Tuple[str, str, List[Tuple[str, str]]]:
+    """Validate one event. Returns (network, event_type, [(field, reason), ...])."""
+    networks, event_types, failures = validate_batch([event])
+    return networks[0], event_types[0], [(field, reason) for _, field, reason in failures]
+
+
+def process_batch(lines: List[bytes], fmt: str, filters: Tuple[Optional[str], Optional[str]],
+                  sample_limit: int) -> dict:
+    """Validate a batch of raw lines. Runs in a worker process."""
+    failures: Counter = Counter()
+    samples: Dict[str, List[str]] = {}
+    want_network, want_event = filters
+
+    stripped = [line for line in (raw.strip() for raw in lines) if line]
+    if fmt == "auto":
+        json_lines = [line for line in stripped if line[:1] == b"{"]
+        query_lines = [line for line in stripped if line[:1] != b"{"]
+    else:
+        json_lines, query_lines = (stripped, []) if fmt == "ndjson" else ([], stripped)
+    parsed = list(zip(json_lines, parse_json_lines(json_lines)))
+    parsed.extend((line, parse_query_line(line.decode("utf-8", errors="replace"))) for line in query_lines)
+
+    sources = [line for line, event in parsed if event is not None]
+    events = [event for _, event in parsed if event is not None]
+    unparsed = len(parsed) - len(events)
+
+    networks, event_types, errors = validate_batch(events)
+    keys = list(zip(networks, event_types))
+    selected = None
+    if want_network or want_event:
+        selected = {i for i, (network, event_type) in enumerate(keys)
+                    if (not want_network or network == want_network)
+                    and (not want_event or event_type == want_event)}
+        totals = Counter(keys[i] for i in sorted(selected))
+    else:
+        totals = Counter(keys)
+
+    for i, field, reason in errors:
+        if selected is not None and i not in selected:
+            continue
+        key = keys[i] + (field, reason)
+        failures[key] += 1
+        if sample_limit:
+            bucket = samples.setdefault("|".join(key), [])
+            if len(bucket) < sample_limit:
+                bucket.append(sources[i].decode("utf-8", errors="replace")[:500])
+
+    return {"totals": totals, "failures": failures, "samples": samples,
+            "unparsed": unparsed, "lines": len(lines)}
+
+
+# === Input ===
+
+def open_dump(path: str):
+    """Open a dump as a binary stream, transparently un-gzipping."""
+    if path == "-":
+        stream = sys.stdin.buffer
+        head = stream.peek(2)[:2] if hasattr(stream, "peek") else b""
+        return gzip.GzipFile(fileobj=stream) if head == b"\x1f\x8b" else stream
+    f = open(path, "rb")
+    if f.read(2) == b"\x1f\x8b":
+        f.close()
+        return gzip.open(path, "rb")
+    f.seek(0)
+    return f
+
+
+def iter_batches(paths: List[str], batch_size: int) -> Iterator[List[bytes]]:
+    """Yield lists of raw lines, batch_size at a time, across all inputs."""
+    batch: List[bytes] = []
+    for path in paths:
+        stream = open_dump(path)
+        try:
+            for line in stream:
+                batch.append(line)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+    if batch:
+        yield batch
+
+
+def merge(result: dict, part: dict, sample_limit: int) -> None:
+    """Fold a batch result into the running result."""
+    result["totals"].update(part["totals"])
+    result["failures"].update(part["failures"])
+    result["unparsed"] += part["unparsed"]
+    result["lines"] += part["lines"]
+    for key, lines in part["samples"].items():
+        bucket = result["samples"].setdefault(key, [])
+        bucket.extend(lines[:sample_limit - len(bucket)])
+
+
+def analyze(paths: List[str], fmt: str, workers: int, batch_size: int,
+            filters: Tuple[Optional[str], Optional[str]], sample_limit: int) -> dict:
+    """Run validation over all inputs with a bounded number of in-flight batches."""
+    result = {"totals": Counter(), "failures": Counter(), "samples": {}, "unparsed": 0, "lines": 0}
+    batches = iter_batches(paths, batch_size)
+
+    if workers <= 1:
+        for batch in batches:
+            merge(result, process_batch(batch, fmt, filters, sample_limit), sample_limit)
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in batches:
+            pending.add(pool.submit(process_batch, batch, fmt, filters, sample_limit))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(result, future.result(), sample_limit)
+        for future in pending:
+            merge(result, future.result(), sample_limit)
+    return result
+
+
+# === Output ===
+
+def build_report(result: dict) -> dict:
+    """Convert counters into a JSON-friendly report sorted by failure count."""
+    failures = []
+    for (network, event_type, field, reason), count in result["failures"].most_common():
+        total = result["totals"][(network, event_type)]
+        entry = {
+            "network": network,
+            "event": event_type,
+            "field": field,
+            "reason": reason,
+            "count": count,
+            "rate": round(count / total, 4) if total else None,
+            "heuristic": event_type in HEURISTIC_REQUIREMENTS,
+        }
+        samples = result["samples"].get("|".join((network, event_type, field, reason)))
+        if samples:
+            entry["samples"] = samples
+        failures.append(entry)
+
+    events = [
+        {"network": network, "event": event_type, "count": count}
+        for (network, event_type), count in result["totals"].most_common()
+    ]
+    return {
+        "lines": result["lines"],
+        "events": sum(result["totals"].values()),
+        "unparsed": result["unparsed"],
+        "failures_total": sum(result["failures"].values()),
+        "by_event": events,
+        "failures": failures,
+    }
+
+
+def output_text(report: dict, limit: int) -> None:
+    """Print a human-readable summary."""
+    print(f"Lines: {report['lines']}  Events: {report['events']}  Unparsed: {report['unparsed']}\n")
+
+    print(f"{'NETWORK':<12} {'EVENT':<18} {'COUNT':>10}")
+    for row in report["by_event"][:limit]:
+        print(f"{row['network']:<12} {row['event']:<18} {row['count']:>10}")
+
+    if not report["failures"]:
+        print("\nNo validation failures.")
+        return
+
+    print(f"\n{'NETWORK':<12} {'EVENT':<18} {'FIELD':<10} {'REASON':<13} {'COUNT':>10} {'RATE':>7}")
+    for row in report["failures"][:limit]:
+        rate = f"{row['rate']:.1%}" if row["rate"] is not None else "-"
+        event = row["event"] + ("*" if row["heuristic"] else "")
+        print(f"{row['network']:<12} {event:<18} {row['field']:<10} "
+              f"{row['reason']:<13} {row['count']:>10} {rate:>7}")
+        for sample in row.get("samples", []):
+            print(f"    e.g. {sample[:160]}")
+    if any(row["heuristic"] for row in report["failures"][:limit]):
+        print("\n* server-side event: no documented required fields, checked with the analyzer's heuristics")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate captured activity/conversion event dumps against event type requirements"
+    )
+    parser.add_argument("inputs", nargs="+", help="NDJSON / query-string dumps, optionally gzipped ('-' for stdin)")
+    parser.add_argument("--format", choices=FORMATS, default="auto", help="Input format (default: auto per line)")
+    parser.add_argument("--network", type=str, help="Only count events from this network")
+    parser.add_argument("--event", type=str, help="Only count this event type (e.g. purchased)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count, 1 disables multiprocessing)",
+    )
+    parser.add_argument("--batch-size", type=int, default=20000, help="Lines per batch (default: 20000)")
+    parser.add_argument("--samples", type=int, default=0, help="Keep N sample lines per failure bucket")
+    parser.add_argument("--limit", type=int, default=50, help="Max rows in text output (default: 50)")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        if path != "-" and not os.path.isfile(path):
+            print(f"Error: input not found: {path}", file=sys.stderr)
+            return 1
+
+    result = analyze(
+        args.inputs,
+        args.format,
+        max(1, args.workers),
+        max(1, args.batch_size),
+        (args.network, args.event),
+        max(0, args.samples),
+    )
+    report = build_report(result)
+
+    if args.json_output:
+        print(json.dumps(report, indent=2))
+    else:
+        output_text(report, args.limit)
+
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,16 +9,21 @@ Usage:
     python check_repos.py --task pixel-modification --auto-clone
     python check_repos.py --repo adplatform --check-only
     python check_repos.py --json
+    python check_repos.py --auto-clone --timing --trace /tmp/setup-trace.jsonl
 """
 
 import argparse
+import atexit
 import json
 import os
-import subprocess
+import shutil
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import proc_trace  # noqa: E402
+
 REQUIRED_REPOS: Dict[str, dict] = {
     "adplatform": {
         "github": "Ringier-Axel-Springer-PL/adplatform",
@@ -78,14 +83,9 @@ VALID_TASKS = [
 
 
 def check_gh_cli() -> bool:
-    """Check if GitHub CLI is installed and authenticated."""
+    """Check if GitHub CLI is installed and authenticated (success is cached briefly)."""
     try:
-        result = subprocess.run(
-            ["gh", "auth", "status"],
-            capture_output=True,
-            text=True,
-        )
-        return result.returncode == 0
+        return proc_trace.gh_auth_ok()
     except FileNotFoundError:
         return False
 
@@ -97,16 +97,23 @@ def repo_exists(workspace: Path, repo_name: str) -> bool:
 
 
 def clone_repo(workspace: Path, repo_name: str, github_path: str) -> bool:
-    """Clone repository using GitHub CLI."""
+    """Clone repository using GitHub CLI; a failed clone leaves no directory."""
+    target = workspace / repo_name
+    created = not target.exists()
     try:
-        result = subprocess.run(
-            ["gh", "repo", "clone", github_path, str(workspace / repo_name)],
-            capture_output=True,
-            text=True,
+        result = proc_trace.run(
+            ["gh", "repo", "clone", github_path, str(target)],
+            timeout=proc_trace.CLONE_TIMEOUT,
         )
+        if result.returncode != 0 and created:
+            # A half-finished clone already has .git and would pass repo_exists()
+            shutil.rmtree(target, ignore_errors=True)
         if result.returncode == 0:
             print(f"  Successfully cloned {repo_name}")
             return True
+        elif result.returncode == proc_trace.TIMEOUT_EXIT_CODE:
+            print(f"  Timed out cloning {repo_name} after {proc_trace.CLONE_TIMEOUT}s")
+            return False
         else:
             print(f"  Error cloning {repo_name}: {result.stderr}")
             return False
@@ -228,6 +235,16 @@ def main():
         dest="json_output",
         help="Output as JSON for programmatic use",
     )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Print a timing summary of gh/git calls to stderr when done",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help=f"Append a span per gh/git call to FILE (JSON lines, same as ${proc_trace.TRACE_ENV})",
+    )
     parser.add_argument(
         "--list-tasks",
         action="store_true",
@@ -235,6 +252,11 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.trace:
+        os.environ[proc_trace.TRACE_ENV] = str(Path(args.trace).resolve())
+    if args.timing:
+        atexit.register(proc_trace.print_summary, proc_trace.SPANS, sys.stderr)
+
     # Handle --list-tasks
     if args.list_tasks:
         print("Available task types:")
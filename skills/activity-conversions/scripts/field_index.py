@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Build a machine-readable index of event fields from adp_events_api builder chains.
+
+Parses adplatform/src/python/adp_events_api/fields/fields.py with `ast` (adplatform
+is never imported) and extracts every `*_field(...)...create()` chain assigned to a
+name or attribute (at module level or inside classes and functions) into an index
+of field name, type, extractor, query argument, datasource dimensions and table
+columns. Chains that are not assigned (e.g. list elements or return values) are
+not indexed. The index is cached by source file hash, so repeated lookups are free.
+
+Usage:
+    python field_index.py [--workspace /path/to/workspace]
+    python field_index.py --query-arg ord
+    python field_index.py --dimension ORDER_ID
+    python field_index.py --field order_id
+    python field_index.py --datasource conversions
+    python field_index.py --markdown
+    python field_index.py --update-reference            # this skill's references/field-reference.md
+    python field_index.py --json
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+FIELDS_PATH = "adplatform/src/python/adp_events_api/fields/fields.py"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "claude-toolkit"
+INDEX_VERSION = 2
+# Reference file next to this script; run the source checkout's copy to update the source
+DEFAULT_REFERENCE = Path(__file__).resolve().parent.parent / "references" / "field-reference.md"
+
+# Builder constructors and the type they produce
+FIELD_CONSTRUCTORS = {
+    "string_field": "string",
+    "int_field": "int",
+    "float_field": "float",
+    "bool_field": "bool",
+    "datetime_field": "datetime",
+    "json_field": "json",
+    "list_field": "list",
+}
+
+# Builder methods that define where the value comes from, with a short label
+EXTRACTORS = {
+    "extract_from_query_arguments": "Query",
+    "extract_from_gctx": "GCTX",
+    "extract_from_cookie": "Cookie",
+    "extract_from_header": "Header",
+    "auto_generate": "Auto",
+}
+
+GENERATED_BEGIN = "<!-- BEGIN GENERATED FIELD INDEX (field_index.py) -->"
+GENERATED_END = "<!-- END GENERATED FIELD INDEX -->"
+
+
+def file_sha256(path: Path) -> str:
+    """Return hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def literal(node: ast.AST):
+    """Convert a builder argument to a JSON-friendly value without evaluating code."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Attribute):
+        # Datasources.conversions -> "conversions"
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, (ast.Set, ast.List, ast.Tuple)):
+        return sorted(str(literal(elt)) for elt in node.elts)
+    if isinstance(node, ast.Dict):
+        return {str(literal(k)): literal(v) for k, v in zip(node.keys, node.values) if k is not None}
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = literal(node.operand)
+        return -value if isinstance(value, (int, float)) else ast.unparse(node)
+    return ast.unparse(node)
+
+
+def unwind_chain(node: ast.AST) -> Optional[tuple]:
+    """Split `ctor(args).m1(...).m2(...)` into (ctor_call, [(method, call), ...])."""
+    calls = []
+    while isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        calls.append((node.func.attr, node))
+        node = node.func.value
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        if node.func.id in FIELD_CONSTRUCTORS:
+            calls.reverse()
+            return node, calls
+    return None
+
+
+def call_arg(call: ast.Call, position: int, keyword: str):
+    """Return a builder argument by keyword or position, or None."""
+    for kw in call.keywords:
+        if kw.arg == keyword:
+            return literal(kw.value)
+    if len(call.args) > position:
+        return literal(call.args[position])
+    return None
+
+
+def parse_field(var_name: str, value: ast.AST, lineno: int) -> Optional[dict]:
+    """Turn one builder chain into an index entry."""
+    chain = unwind_chain(value)
+    if chain is None:
+        return None
+    ctor, methods = chain
+
+    entry = {
+        "variable": var_name,
+        "name": call_arg(ctor, 0, "name"),
+        "type": FIELD_CONSTRUCTORS[ctor.func.id],
+        "line": lineno,
+        "description": None,
+        "default": None,
+        "gdpr_purpose": None,
+        "extractors": [],
+        "query_arg": None,
+        "dimensions": [],
+        "table_columns": [],
+    }
+
+    for method, call in methods:
+        if method == "with_description":
+            entry["description"] = call_arg(call, 0, "description")
+        elif method == "with_default":
+            entry["default"] = call_arg(call, 0, "default")
+        elif method == "with_gdpr_purpose":
+            entry["gdpr_purpose"] = call_arg(call, 0, "purpose")
+        elif method in EXTRACTORS:
+            source = call_arg(call, 0, "name")
+            if source is None:
+                source = call_arg(call, 0, "key")
+            entry["extractors"].append({"kind": EXTRACTORS[method], "source": source})
+            if method == "extract_from_query_arguments" and entry["query_arg"] is None:
+                entry["query_arg"] = source
+        elif method == "set_as_datasource_dimension":
+            entry["dimensions"].append({
+                "dimension": call_arg(call, 0, "name"),
+                "datasources": _as_list(call_arg(call, 1, "datasources")),
+            })
+        elif method == "set_as_table_column":
+            entry["table_columns"].append({
+                "column": call_arg(call, 0, "name"),
+                "tables": _as_list(call_arg(call, 1, "tables")),
+            })
+
+    return entry
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [str(value)]
+
+
+def _assignments(body: List[ast.stmt], scope: str) -> Iterator[Tuple[str, ast.AST, int]]:
+    """(qualified target, value, line) for each assignment in body, at any nesting depth."""
+    for node in body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target, value = node.target, node.value
+        else:
+            target = value = None
+        if isinstance(target, (ast.Name, ast.Attribute)):
+            yield scope + ast.unparse(target), value, node.lineno
+
+        inner = f"{scope}{node.name}." if isinstance(
+            node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) else scope
+        # Nested blocks: class/def bodies, if/for/while/with/try branches, except handlers
+        for block in ("body", "orelse", "finalbody"):
+            stmts = getattr(node, block, None)
+            if isinstance(stmts, list):
+                yield from _assignments(stmts, inner)
+        for handler in getattr(node, "handlers", []):
+            yield from _assignments(handler.body, inner)
+
+
+def extract_fields(source: str, filename: str = "<fields>") -> List[dict]:
+    """Extract all builder-defined fields from module source.
+
+    Variables inside classes and functions are qualified (FieldSet.order_id).
+    """
+    tree = ast.parse(source, filename=filename)
+    fields = []
+    for target, value, lineno in _assignments(tree.body, ""):
+        entry = parse_field(target, value, lineno)
+        if entry is not None:
+            fields.append(entry)
+    return fields
+
+
+def build_lookups(fields: List[dict]) -> Dict[str, Dict[str, List[str]]]:
+    """Build reverse lookups (query arg / dimension / datasource -> field names)."""
+    lookups: Dict[str, Dict[str, List[str]]] = {
+        "by_query_arg": {},
+        "by_dimension": {},
+        "by_datasource": {},
+        "by_table": {},
+    }
+    for field in fields:
+        name = field["name"]
+        if field["query_arg"]:
+            lookups["by_query_arg"].setdefault(field["query_arg"], []).append(name)
+        for dim in field["dimensions"]:
+            lookups["by_dimension"].setdefault(str(dim["dimension"]), []).append(name)
+            for ds in dim["datasources"]:
+                lookups["by_datasource"].setdefault(ds, []).append(name)
+        for col in field["table_columns"]:
+            for table in col["tables"]:
+                lookups["by_table"].setdefault(table, []).append(name)
+    return lookups
+
+
+def cache_path_for(source_path: Path, cache_dir: Path) -> Path:
+    """Cache file location for a given fields.py (one per source path)."""
+    key = hashlib.sha1(str(source_path).encode()).hexdigest()[:12]
+    return cache_dir / f"field_index-{key}.json"
+
+
+def load_index(source_path: Path, cache_dir: Path, rebuild: bool = False) -> dict:
+    """Load the index from cache, re-parsing only if the source hash changed."""
+    digest = file_sha256(source_path)
+    cache_file = cache_path_for(source_path, cache_dir)
+
+    if not rebuild and cache_file.exists():
+        try:
+            cached = json.loads(cache_file.read_text())
+            if cached.get("version") == INDEX_VERSION and cached.get("source_sha256") == digest:
+                return cached
+        except (OSError, ValueError):
+            pass
+
+    fields = extract_fields(source_path.read_text(), filename=str(source_path))
+    index = {
+        "version": INDEX_VERSION,
+        "source": str(source_path),
+        "source_sha256": digest,
+        "fields": fields,
+        "lookups": build_lookups(fields),
+    }
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, indent=1))
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_file}: {e}", file=sys.stderr)
+
+    return index
+
+
+def format_extractor(field: dict) -> str:
+    """Short human label for a field's extractor(s)."""
+    if not field["extractors"]:
+        return "-"
+    parts = []
+    for ex in field["extractors"]:
+        parts.append(f"{ex['kind']} `{ex['source']}`" if ex["source"] else ex["kind"])
+    return ", ".join(parts)
+
+
+def _md_cell(value) -> str:
+    return str(value).replace("|", "\\|").replace("\n", " ") if value else "-"
+
+
+def render_markdown(index: dict) -> str:
+    """Render the index as Markdown tables (fields, datasource dimensions, table columns)."""
+    fields = sorted(index["fields"], key=lambda f: str(f["name"]))
+    lines = [
+        f"_Generated from `{FIELDS_PATH}` (sha256 `{index['source_sha256'][:12]}`). "
+        "Do not edit by hand; run `scripts/field_index.py --update-reference`._",
+        "",
+        "### Fields",
+        "",
+        "| Field | Type | Extractor | Query Param | Description |",
+        "|-------|------|-----------|-------------|-------------|",
+    ]
+    for f in fields:
+        query_arg = f"`{f['query_arg']}`" if f["query_arg"] else "-"
+        lines.append(
+            f"| `{f['name']}` | {f['type']} | {format_extractor(f)} | {query_arg} | {_md_cell(f['description'])} |"
+        )
+
+    lines += [
+        "",
+        "### Datasource Dimensions",
+        "",
+        "| Dimension | Field | Query Param | Datasources |",
+        "|-----------|-------|-------------|-------------|",
+    ]
+    for f in fields:
+        for dim in f["dimensions"]:
+            query_arg = f"`{f['query_arg']}`" if f["query_arg"] else "-"
+            datasources = ", ".join(dim["datasources"]) or "-"
+            lines.append(f"| `{dim['dimension']}` | `{f['name']}` | {query_arg} | {datasources} |")
+
+    lines += [
+        "",
+        "### Table Columns",
+        "",
+        "| Column | Field | Tables |",
+        "|--------|-------|--------|",
+    ]
+    for f in fields:
+        for col in f["table_columns"]:
+            tables = ", ".join(col["tables"]) or "-"
+            lines.append(f"| `{col['column']}` | `{f['name']}` | {tables} |")
+
+    return "\n".join(lines) + "\n"
+
+
+def update_reference(reference: Path, markdown: str) -> None:
+    """Replace the generated block in a reference file.
+
+    Raises ValueError for files without the generated block markers.
+    """
+    content = reference.read_text()
+    start = content.find(GENERATED_BEGIN)
+    end = content.find(GENERATED_END)
+    if start == -1 or end == -1 or end < start:
+        raise ValueError(f"{reference} has no generated block ({GENERATED_BEGIN} ... {GENERATED_END})")
+    block = f"{GENERATED_BEGIN}\n{markdown}{GENERATED_END}"
+    reference.write_text(content[:start] + block + content[end + len(GENERATED_END):])
+
+
+def find_fields(index: dict, args: argparse.Namespace) -> Optional[List[dict]]:
+    """Apply lookup filters. Returns None if no filter was requested."""
+    lookups = index["lookups"]
+    if args.query_arg:
+        names = set(lookups["by_query_arg"].get(args.query_arg, []))
+    elif args.dimension:
+        names = set(lookups["by_dimension"].get(args.dimension, []))
+    elif args.datasource:
+        names = set(lookups["by_datasource"].get(args.datasource, []))
+    elif args.field:
+        names = {args.field}
+    else:
+        return None
+    return [f for f in index["fields"]
+            if f["name"] in names or f["variable"] in names or f["variable"].rsplit(".", 1)[-1] in names]
+
+
+def output_text(fields: List[dict]) -> None:
+    """Print matching fields in a compact text form."""
+    for f in fields:
+        print(f"{f['name']} ({f['type']}) - {f['variable']}, line {f['line']}")
+        print(f"  extractor: {format_extractor(f)}")
+        for dim in f["dimensions"]:
+            print(f"  dimension: {dim['dimension']} -> {', '.join(dim['datasources']) or '-'}")
+        for col in f["table_columns"]:
+            print(f"  column:    {col['column']} -> {', '.join(col['tables']) or '-'}")
+        if f["description"]:
+            print(f"  {f['description']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Index adp_events_api field definitions without importing adplatform"
+    )
+    parser.add_argument(
+        "--workspace",
+        type=str,
+        default=os.getcwd(),
+        help="Workspace directory containing adplatform (default: current directory)",
+    )
+    parser.add_argument(
+        "--source",
+        type=str,
+        help=f"Path to fields.py (default: <workspace>/{FIELDS_PATH})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Index cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Ignore cached index")
+    lookup = parser.add_mutually_exclusive_group()
+    lookup.add_argument("--query-arg", help="Fields fed by this query parameter (e.g. ord)")
+    lookup.add_argument("--dimension", help="Fields backing this Druid dimension (e.g. ORDER_ID)")
+    lookup.add_argument("--datasource", help="Fields registered in this datasource (e.g. conversions)")
+    lookup.add_argument("--field", help="Single field by name or variable")
+    parser.add_argument("--markdown", action="store_true", help="Print Markdown tables")
+    parser.add_argument(
+        "--update-reference",
+        nargs="?",
+        const=str(DEFAULT_REFERENCE),
+        metavar="FILE",
+        help="Rewrite the generated block of a reference Markdown file "
+             "(default: references/field-reference.md of the skill this script belongs to)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    source = Path(args.source) if args.source else Path(args.workspace) / FIELDS_PATH
+    source = source.expanduser().resolve()
+    if not source.is_file():
+        print(f"Error: fields module not found: {source}", file=sys.stderr)
+        print("Run check_repos.py --repo adplatform to clone it.", file=sys.stderr)
+        return 1
+
+    try:
+        index = load_index(source, Path(args.cache_dir).expanduser(), rebuild=args.rebuild)
+    except SyntaxError as e:
+        print(f"Error: cannot parse {source}: {e}", file=sys.stderr)
+        return 1
+
+    if args.update_reference:
+        try:
+            update_reference(Path(args.update_reference), render_markdown(index))
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Updated {args.update_reference} ({len(index['fields'])} fields)")
+        return 0
+
+    if args.markdown:
+        print(render_markdown(index), end="")
+        return 0
+
+    matches = find_fields(index, args)
+    if matches is None:
+        if args.json_output:
+            print(json.dumps(index, indent=2))
+        else:
+            print(f"Indexed {len(index['fields'])} fields from {source}")
+            print(f"Query args: {len(index['lookups']['by_query_arg'])}, "
+                  f"dimensions: {len(index['lookups']['by_dimension'])}")
+        return 0
+
+    if args.json_output:
+        print(json.dumps(matches, indent=2))
+    else:
+        output_text(matches)
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
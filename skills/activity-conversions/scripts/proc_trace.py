@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Traced subprocess layer for the toolkit scripts (gh / git calls).
+
+Every call made through `run()` gets a timeout and records a span: command,
+duration, exit code and output size. The command runs in its own process group,
+and a timeout kills the whole group (e.g. the `git clone` started by `gh`). Spans are kept in memory and, when
+CLAUDE_TOOLKIT_TRACE points at a file, appended to it as JSON lines so that
+several scripts (and clone_repo.sh) can contribute to one trace. `gh_auth_ok()`
+caches a successful `gh auth status` for a short TTL.
+
+Skills are installed independently, so each skill that needs this module ships
+an identical copy of it; scripts/check_shared_modules.py (repository root) fails
+while the copies differ.
+
+Usage:
+    python proc_trace.py summary <trace.jsonl>
+    python proc_trace.py chrome <trace.jsonl> -o trace.json   # chrome://tracing / Perfetto
+    python proc_trace.py run --timeout 900 [--cleanup DIR] -- gh repo clone ...  # detached jobs
+"""
+# shared-module: copies in other skills must stay byte-identical
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACE_ENV = "CLAUDE_TOOLKIT_TRACE"
+CACHE_DIR = Path.home() / ".cache" / "claude-toolkit"
+AUTH_CACHE = CACHE_DIR / "gh-auth.json"
+AUTH_TTL_ENV = "CLAUDE_TOOLKIT_GH_AUTH_TTL"
+
+# Default timeouts in seconds
+DEFAULT_TIMEOUT = 60
+AUTH_TIMEOUT = 15
+CLONE_TIMEOUT = 900
+AUTH_TTL = 300
+
+# Exit code reported for calls killed by the timeout (same as coreutils `timeout`)
+TIMEOUT_EXIT_CODE = 124
+
+SPANS: List[dict] = []
+
+
+def _label(cmd: List[str]) -> str:
+    """Short grouping key: the tool plus its subcommand(s), without arguments."""
+    words = [c for c in cmd[:3] if not c.startswith("-") and "/" not in c]
+    return " ".join(words) or cmd[0]
+
+
+def record(span: dict) -> None:
+    """Keep a span in memory and append it to the trace file if one is configured."""
+    SPANS.append(span)
+    trace_file = os.environ.get(TRACE_ENV)
+    if not trace_file:
+        return
+    try:
+        with open(trace_file, "a") as f:
+            f.write(json.dumps(span) + "\n")
+    except OSError:
+        pass
+
+
+def run(cmd: List[str], timeout: Optional[float] = DEFAULT_TIMEOUT, label: Optional[str] = None,
+        **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run with a timeout and a recorded span.
+
+    Output is captured. A timeout does not raise: the process group is killed and
+    the result has returncode 124 and the partial output. FileNotFoundError (tool
+    not installed) is recorded and re-raised.
+    """
+    if kwargs.pop("capture_output", True):
+        kwargs.setdefault("stdout", subprocess.PIPE)
+        kwargs.setdefault("stderr", subprocess.PIPE)
+    kwargs.setdefault("text", True)
+    kwargs["start_new_session"] = True
+    stdin_data = kwargs.pop("input", None)
+    if stdin_data is not None:
+        kwargs["stdin"] = subprocess.PIPE
+    span = {
+        "ts": time.time(),
+        "pid": os.getpid(),
+        "label": label or _label(cmd),
+        "cmd": " ".join(cmd),
+        "timeout_s": timeout,
+    }
+    start = time.perf_counter()
+    try:
+        proc = subprocess.Popen(cmd, **kwargs)
+    except FileNotFoundError:
+        span.update(exit_code=127, timed_out=False, duration_ms=_elapsed_ms(start),
+                    stdout_bytes=0, stderr_bytes=0)
+        record(span)
+        raise
+    with proc:
+        try:
+            stdout, stderr = proc.communicate(stdin_data, timeout=timeout)
+            result = subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+            span.update(exit_code=proc.returncode, timed_out=False)
+        except subprocess.TimeoutExpired:
+            _kill_group(proc)
+            stdout, stderr = proc.communicate()
+            result = subprocess.CompletedProcess(
+                cmd, TIMEOUT_EXIT_CODE, stdout, stderr or f"timed out after {timeout}s",
+            )
+            span.update(exit_code=TIMEOUT_EXIT_CODE, timed_out=True)
+        except BaseException:  # Ctrl-C: the group no longer gets the terminal's signal
+            _kill_group(proc)
+            raise
+    span.update(
+        duration_ms=_elapsed_ms(start),
+        stdout_bytes=_size(result.stdout),
+        stderr_bytes=_size(result.stderr),
+    )
+    record(span)
+    return result
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    """Kill the command and everything it started (it leads its own session)."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    proc.wait()
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _size(output) -> int:
+    if output is None:
+        return 0
+    return len(output.encode(errors="replace")) if isinstance(output, str) else len(output)
+
+
+def gh_auth_ok(ttl: Optional[float] = None) -> bool:
+    """`gh auth status` with a short-lived cache of successful results.
+
+    Only success is cached, so logging in takes effect immediately. Raises
+    FileNotFoundError when gh is not installed.
+    """
+    if ttl is None:
+        ttl = float(os.environ.get(AUTH_TTL_ENV, AUTH_TTL))
+    try:
+        cached = json.loads(AUTH_CACHE.read_text())
+        if cached.get("ok") and time.time() - cached.get("checked_at", 0) < ttl:
+            record({"ts": time.time(), "pid": os.getpid(), "label": "gh auth status",
+                    "cmd": "gh auth status", "cached": True, "exit_code": 0, "timed_out": False,
+                    "duration_ms": 0.0, "stdout_bytes": 0, "stderr_bytes": 0})
+            return True
+    except (OSError, ValueError):
+        pass
+
+    result = run(["gh", "auth", "status"], timeout=AUTH_TIMEOUT)
+    ok = result.returncode == 0
+    if ok:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            AUTH_CACHE.write_text(json.dumps({"ok": True, "checked_at": time.time()}))
+        except OSError:
+            pass
+    return ok
+
+
+# === Reporting ===
+
+def load_spans(path: Path) -> List[dict]:
+    """Read spans from a JSON-lines trace file (bad lines are skipped)."""
+    spans = []
+    with open(path) as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def summarize(spans: List[dict]) -> List[Dict]:
+    """Aggregate spans per label: count, total/p50/max duration, failures, timeouts, bytes."""
+    groups: Dict[str, List[dict]] = {}
+    for span in spans:
+        groups.setdefault(span.get("label", "?"), []).append(span)
+    rows = []
+    for label, items in groups.items():
+        durations = sorted(s.get("duration_ms", 0.0) for s in items)
+        rows.append({
+            "label": label,
+            "calls": len(items),
+            "cached": sum(1 for s in items if s.get("cached")),
+            "total_ms": round(sum(durations), 1),
+            "p50_ms": durations[len(durations) // 2],
+            "max_ms": durations[-1],
+            "failed": sum(1 for s in items if s.get("exit_code") not in (0, None) and not s.get("timed_out")),
+            "timeouts": sum(1 for s in items if s.get("timed_out")),
+            "output_bytes": sum(s.get("stdout_bytes", 0) + s.get("stderr_bytes", 0) for s in items),
+        })
+    return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+
+def print_summary(spans: List[dict], out=sys.stdout) -> None:
+    """Print the per-command summary table."""
+    rows = summarize(spans)
+    if not rows:
+        print("No subprocess calls recorded.", file=out)
+        return
+    header = f"{'COMMAND':<24} {'CALLS':>5} {'CACHED':>6} {'TOTAL ms':>10} {'P50 ms':>9} " \
+             f"{'MAX ms':>9} {'FAIL':>4} {'T/O':>4} {'BYTES':>9}"
+    print(header, file=out)
+    for r in rows:
+        print(f"{r['label'][:24]:<24} {r['calls']:>5} {r['cached']:>6} {r['total_ms']:>10} "
+              f"{r['p50_ms']:>9} {r['max_ms']:>9} {r['failed']:>4} {r['timeouts']:>4} "
+              f"{r['output_bytes']:>9}", file=out)
+
+
+def to_chrome_trace(spans: List[dict]) -> dict:
+    """Convert spans to Chrome trace event format (complete events)."""
+    events = []
+    for span in spans:
+        events.append({
+            "name": span.get("label", "?"),
+            "cat": "subprocess",
+            "ph": "X",
+            "ts": int(span.get("ts", 0) * 1e6),
+            "dur": int(span.get("duration_ms", 0) * 1000),
+            "pid": span.get("pid", 0),
+            "tid": span.get("pid", 0),
+            "args": {k: span.get(k) for k in ("cmd", "exit_code", "timed_out", "cached",
+                                              "stdout_bytes", "stderr_bytes")},
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize toolkit subprocess traces")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("summary", "Per-command summary table"),
+                            ("chrome", "Chrome trace event JSON")):
+        report = sub.add_parser(name, help=help_text)
+        report.add_argument("trace", help=f"JSON-lines trace file (as written via {TRACE_ENV})")
+        report.add_argument("-o", "--output", help="Output file for 'chrome' (default: stdout)")
+        report.add_argument(
+            "--json",
+            action="store_true",
+            dest="json_output",
+            help="Output summary as JSON for programmatic use",
+        )
+    call = sub.add_parser("run", help="Run one command with a timeout and record its span")
+    call.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                      help=f"Seconds before the command is killed (default: {DEFAULT_TIMEOUT})")
+    call.add_argument("--label", help="Span label (default: tool and subcommand)")
+    call.add_argument("--cleanup", metavar="DIR",
+                      help="Delete DIR if the command fails or times out (e.g. a partial clone)")
+    call.add_argument("cmd", nargs=argparse.REMAINDER, help="Command to run (after --)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not cmd:
+            parser.error("run: missing command")
+        # Only a directory the command itself created is removed on failure.
+        cleanup = args.cleanup if args.cleanup and not os.path.exists(args.cleanup) else None
+        # Output goes straight to our stdout/stderr (e.g. a log file for detached jobs).
+        try:
+            result = run(cmd, timeout=args.timeout, label=args.label, capture_output=False)
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 127
+        if result.returncode == TIMEOUT_EXIT_CODE:
+            print(f"Error: {' '.join(cmd)} timed out after {args.timeout:g}s", file=sys.stderr)
+        if result.returncode != 0 and cleanup:
+            shutil.rmtree(cleanup, ignore_errors=True)
+        return result.returncode
+
+    try:
+        spans = load_spans(Path(args.trace))
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == "chrome":
+        data = json.dumps(to_chrome_trace(spans))
+        if args.output:
+            Path(args.output).write_text(data)
+            print(f"Wrote {len(spans)} span(s) to {args.output}")
+        else:
+            print(data)
+    elif args.json_output:
+        print(json.dumps(summarize(spans), indent=2))
+    else:
+        print_summary(spans)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
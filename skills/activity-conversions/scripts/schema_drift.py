@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Check schema drift between DataLake Glue schemas and Druid datasource definitions.
+
+Walks data-lake-glue-datasources/json_schemas/adp/ and adp-reports-defs/defs/,
+builds per-table and per-datasource column sets (e.g. adp_conversions vs
+adp-conversions) and reports fields missing on one side or with mismatched types.
+Files are hashed and decoded in one streaming pass (top-level arrays element by
+element; a single top-level object is decoded whole), and parsed column sets are
+cached per file: an unchanged stat reuses the entry, and on a stat change an
+unchanged SHA-256 only refreshes the stat, so re-runs only re-parse definitions
+whose content changed.
+
+Usage:
+    python schema_drift.py [--workspace /path/to/workspace]
+    python schema_drift.py --field order_id
+    python schema_drift.py --pair adp_conversions=adp-conversions
+    python schema_drift.py --json
+"""
+
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+GLUE_PATH = "data-lake-glue-datasources/json_schemas/adp"
+DRUID_PATH = "adp-reports-defs/defs"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "claude-toolkit"
+CACHE_VERSION = 1
+READ_CHUNK = 1 << 20
+
+JSON_DECODER = json.JSONDecoder()
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+# Canonical type names for comparison across Glue / JSON schema / Druid
+TYPE_ALIASES = {
+    "string": "string", "varchar": "string", "char": "string", "text": "string",
+    "int": "long", "integer": "long", "bigint": "long", "smallint": "long",
+    "tinyint": "long", "long": "long",
+    "float": "double", "double": "double", "number": "double", "decimal": "double",
+    "boolean": "boolean", "bool": "boolean",
+    "timestamp": "timestamp", "date": "timestamp",
+    "json": "complex", "object": "complex", "array": "complex", "struct": "complex",
+    "map": "complex",
+}
+
+# Druid has no boolean column type: booleans are ingested as string or long
+COMPATIBLE_TYPES = {
+    ("boolean", "string"), ("boolean", "long"),
+    ("timestamp", "string"), ("timestamp", "long"),
+}
+
+
+def canonical_type(raw) -> str:
+    """Normalize a type declaration to a canonical name ('unknown' if unrecognized)."""
+    if isinstance(raw, list):
+        # JSON schema union, e.g. ["null", "string"]
+        non_null = [t for t in raw if t != "null"]
+        raw = non_null[0] if non_null else "null"
+    if not isinstance(raw, str):
+        return "unknown"
+    t = raw.strip().lower()
+    # Glue parametrized types: array<string>, decimal(10,2), struct<...>
+    for sep in ("<", "("):
+        if sep in t:
+            t = t.split(sep, 1)[0]
+    # Druid metric aggregators: longSum, doubleMax, floatLast...
+    for prefix in ("long", "double", "float"):
+        if t.startswith(prefix) and t != prefix:
+            t = prefix
+    return TYPE_ALIASES.get(t, "unknown")
+
+
+def normalize_name(name: str) -> str:
+    """Column names compare case-insensitively (Glue lowercases, Druid dims are often upper)."""
+    return name.strip().lower()
+
+
+def normalize_source(name: str) -> str:
+    """Table/datasource key: adp-conversions and adp_conversions pair up."""
+    return name.strip().lower().replace("-", "_")
+
+
+# === Parsers ===
+
+def glue_columns(doc) -> Tuple[Optional[str], Dict[str, str]]:
+    """Extract (table name, {column: type}) from a Glue table or JSON-schema document."""
+    name = None
+    columns: Dict[str, str] = {}
+    if not isinstance(doc, dict):
+        return name, columns
+
+    name = doc.get("TableName") or doc.get("Name") or doc.get("name") or doc.get("title")
+
+    if isinstance(doc.get("properties"), dict):
+        for col, spec in doc["properties"].items():
+            columns[col] = canonical_type(spec.get("type") if isinstance(spec, dict) else spec)
+        return name, columns
+
+    descriptor = doc.get("StorageDescriptor") or doc.get("Table", {}).get("StorageDescriptor") or doc
+    col_list = descriptor.get("Columns") or descriptor.get("columns") or []
+    col_list = list(col_list) + list(doc.get("PartitionKeys") or [])
+    for col in col_list:
+        if isinstance(col, dict):
+            col_name = col.get("Name") or col.get("name")
+            if col_name:
+                columns[col_name] = canonical_type(col.get("Type") or col.get("type"))
+    return name, columns
+
+
+def druid_columns(doc) -> Tuple[Optional[str], Dict[str, str]]:
+    """Extract (datasource name, {column: type}) from a Druid ingestion spec."""
+    if not isinstance(doc, dict):
+        return None, {}
+    spec = doc.get("spec", doc)
+    schema = spec.get("dataSchema") or doc.get("dataSchema") or {}
+    name = schema.get("dataSource") or doc.get("dataSource") or doc.get("name")
+    columns: Dict[str, str] = {}
+
+    dims = (schema.get("dimensionsSpec") or {}).get("dimensions") or []
+    for dim in dims:
+        if isinstance(dim, str):
+            columns[dim] = "string"
+        elif isinstance(dim, dict) and dim.get("name"):
+            columns[dim["name"]] = canonical_type(dim.get("type", "string"))
+
+    for metric in schema.get("metricsSpec") or []:
+        if not isinstance(metric, dict) or metric.get("type") == "count":
+            continue
+        source = metric.get("fieldName") or metric.get("name")
+        if source:
+            columns.setdefault(source, canonical_type(metric.get("type")))
+    return name, columns
+
+
+PARSERS = {"glue": glue_columns, "druid": druid_columns}
+
+
+class JsonStream:
+    """Incremental reader for the top-level JSON values of a binary file.
+
+    Every byte read is also fed to `digest`, so a file is hashed and parsed in one
+    pass. The elements of a top-level array (and concatenated documents) are
+    decoded one at a time with raw_decode, so memory is bounded by the largest
+    single spec rather than the whole file. A file holding one top-level object
+    (the usual one spec per file) is still buffered and decoded whole.
+    """
+
+    def __init__(self, stream, digest):
+        self.stream = stream
+        self.digest = digest
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self, size: int = READ_CHUNK) -> bool:
+        """Append the next chunk to the buffer (dropping consumed text). False at end of file."""
+        if self.eof:
+            return False
+        data = self.stream.read(size)
+        self.digest.update(data)
+        self.eof = not data
+        self.buf = self.buf[self.pos:] + self.decoder.decode(data, final=self.eof)
+        self.pos = 0
+        return not self.eof
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of file)."""
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read():
+                return ""
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = JSON_DECODER.raw_decode(self.buf, self.pos)
+            except ValueError:
+                # Incomplete value: grow the buffer geometrically so retries stay linear
+                if self._read(max(READ_CHUNK, len(self.buf) - self.pos)):
+                    continue
+                raise
+            # A value ending at the buffer end (or a number cut mid-token) may continue
+            cut = end == len(self.buf) or (
+                isinstance(value, (int, float)) and self.buf[end] in NUMBER_CHARS
+            )
+            if cut and self._read():
+                continue
+            self.pos = end
+            return value
+
+    def documents(self) -> Iterator:
+        """Yield top-level values; a top-level array yields its elements. Raises ValueError."""
+        if self._peek() == "[":
+            self.pos += 1
+            if self._peek() == "]":
+                self.pos += 1
+            else:
+                while True:
+                    yield self._value()
+                    separator = self._peek()
+                    if separator not in (",", "]"):
+                        raise ValueError(f"expected ',' or ']' in top-level array, got {separator!r}")
+                    self.pos += 1
+                    if separator == "]":
+                        break
+        while self._peek():
+            yield self._value()
+
+
+def parse_file(path: Path, kind: str) -> dict:
+    """Parse one definition file into a cache entry (hashed in the same read)."""
+    digest = hashlib.sha256()
+    entry = {"name": None, "columns": {}, "error": None}
+    with open(path, "rb") as f:
+        try:
+            # Some repos keep several specs per file
+            for doc in JsonStream(f, digest).documents():
+                name, columns = PARSERS[kind](doc)
+                entry["name"] = entry["name"] or name
+                entry["columns"].update(columns)
+        except ValueError as e:
+            entry["error"] = f"invalid JSON: {e}"
+            for block in iter(lambda: f.read(READ_CHUNK), b""):
+                digest.update(block)
+    entry["sha256"] = digest.hexdigest()
+    if entry["name"] is None:
+        entry["name"] = path.stem
+    return entry
+
+
+# === Cache ===
+
+def load_cache(cache_file: Path) -> Dict[str, dict]:
+    """Load per-file cache, or an empty one on any problem."""
+    try:
+        cached = json.loads(cache_file.read_text())
+        if cached.get("version") == CACHE_VERSION:
+            return cached["files"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def save_cache(cache_file: Path, files: Dict[str, dict]) -> None:
+    """Atomically write the per-file cache."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "files": files}))
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_file}: {e}", file=sys.stderr)
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_tree(root: Path, kind: str, cache: Dict[str, dict], stats: Dict[str, int]) -> Dict[str, dict]:
+    """Parse all JSON files under root, reusing cache entries for files with unchanged stat or content."""
+    results: Dict[str, dict] = {}
+    for path in sorted(root.rglob("*.json")):
+        key = str(path)
+        st = path.stat()
+        cached = cache.get(key)
+        if cached and cached.get("kind") == kind:
+            same_stat = cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns
+            # Touched but not edited (checkout, rebase): only the stat needs refreshing
+            if same_stat or file_sha256(path) == cached.get("sha256"):
+                cached.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                results[key] = cached
+                stats["cached"] += 1
+                continue
+
+        entry = parse_file(path, kind)
+        entry.update(kind=kind, size=st.st_size, mtime_ns=st.st_mtime_ns)
+        results[key] = entry
+        stats["parsed"] += 1
+    return results
+
+
+# === Comparison ===
+
+def group_by_source(entries: Dict[str, dict]) -> Dict[str, dict]:
+    """Merge files into {normalized source: {name, files, columns}}."""
+    grouped: Dict[str, dict] = {}
+    for path, entry in entries.items():
+        if entry.get("error"):
+            continue
+        key = normalize_source(entry["name"])
+        group = grouped.setdefault(key, {"name": entry["name"], "files": [], "columns": {}})
+        group["files"].append(path)
+        group["columns"].update(entry["columns"])
+    return grouped
+
+
+def types_compatible(glue_type: str, druid_type: str) -> bool:
+    """Whether a Glue column type can back a Druid column type."""
+    if "unknown" in (glue_type, druid_type) or glue_type == druid_type:
+        return True
+    return (glue_type, druid_type) in COMPATIBLE_TYPES
+
+
+def compare(table: dict, datasource: dict) -> dict:
+    """Compare one Glue table with one Druid datasource."""
+    t_cols = {normalize_name(k): (k, v) for k, v in table["columns"].items()}
+    d_cols = {normalize_name(k): (k, v) for k, v in datasource["columns"].items()}
+    mismatched = []
+    for key in sorted(t_cols.keys() & d_cols.keys()):
+        (t_name, t_type), (d_name, d_type) = t_cols[key], d_cols[key]
+        if not types_compatible(t_type, d_type):
+            mismatched.append({"column": t_name, "druid_column": d_name,
+                               "table_type": t_type, "datasource_type": d_type})
+    return {
+        "table": table["name"],
+        "datasource": datasource["name"],
+        "only_in_table": sorted(t_cols[k][0] for k in t_cols.keys() - d_cols.keys()),
+        "only_in_datasource": sorted(d_cols[k][0] for k in d_cols.keys() - t_cols.keys()),
+        "type_mismatches": mismatched,
+    }
+
+
+def pair_sources(tables: Dict[str, dict], datasources: Dict[str, dict],
+                 explicit: List[str]) -> List[Tuple[str, str]]:
+    """Pair tables with datasources by normalized name plus explicit --pair overrides."""
+    pairs = {}
+    for key in tables:
+        if key in datasources:
+            pairs[key] = key
+    for item in explicit:
+        table, _, datasource = item.partition("=")
+        pairs[normalize_source(table)] = normalize_source(datasource)
+    return sorted(pairs.items())
+
+
+def pair_status(report: dict) -> str:
+    """MISMATCH (incompatible types), MISSING (Druid column without a Glue column) or OK.
+
+    Glue-only columns are not drift: datasources carry a subset of the table.
+    """
+    if report["type_mismatches"]:
+        return "MISMATCH"
+    if report["only_in_datasource"]:
+        return "MISSING"
+    return "OK"
+
+
+def check_field(field: str, tables: Dict[str, dict], datasources: Dict[str, dict]) -> dict:
+    """Report where a single field is present across all tables and datasources."""
+    wanted = normalize_name(field)
+
+    def where(groups):
+        found = {}
+        for g in groups.values():
+            for col, typ in g["columns"].items():
+                if normalize_name(col) == wanted:
+                    found[g["name"]] = typ
+        return found
+
+    return {"field": field, "tables": where(tables), "datasources": where(datasources)}
+
+
+def output_text(reports: List[dict], unpaired: dict, field_report: Optional[dict]) -> None:
+    """Print drift report as human-readable text."""
+    if field_report:
+        print(f"Field '{field_report['field']}':")
+        for label in ("tables", "datasources"):
+            found = field_report[label]
+            print(f"  {label}: " + (", ".join(f"{k} ({v})" for k, v in sorted(found.items())) or "MISSING"))
+        print()
+
+    for r in reports:
+        print(f"[{r['status']}] {r['table']} <-> {r['datasource']}")
+        for m in r["type_mismatches"]:
+            print(f"     type: {m['column']} is {m['table_type']} in Glue, "
+                  f"{m['datasource_type']} in Druid ({m['druid_column']})")
+        if r["only_in_datasource"]:
+            print(f"     missing in Glue: {', '.join(r['only_in_datasource'])}")
+        if r["only_in_table"]:
+            print(f"     not in Druid: {len(r['only_in_table'])} column(s)")
+
+    for label, names in unpaired.items():
+        if names:
+            print(f"\nUnpaired {label}: {', '.join(names)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check schema drift between Glue table schemas and Druid datasource defs"
+    )
+    parser.add_argument(
+        "--workspace",
+        type=str,
+        default=os.getcwd(),
+        help="Workspace directory with both repos cloned (default: current directory)",
+    )
+    parser.add_argument("--glue-dir", type=str, help=f"Glue schemas (default: <workspace>/{GLUE_PATH})")
+    parser.add_argument("--druid-dir", type=str, help=f"Druid defs (default: <workspace>/{DRUID_PATH})")
+    parser.add_argument(
+        "--pair",
+        action="append",
+        default=[],
+        help="Explicit table=datasource pairing (repeatable), e.g. adp_offer_conversions=adp-offers",
+    )
+    parser.add_argument("--field", type=str, help="Check a single field lands in both trees")
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    workspace = Path(args.workspace).resolve()
+    glue_dir = Path(args.glue_dir) if args.glue_dir else workspace / GLUE_PATH
+    druid_dir = Path(args.druid_dir) if args.druid_dir else workspace / DRUID_PATH
+    for label, path in (("Glue schemas", glue_dir), ("Druid defs", druid_dir)):
+        if not path.is_dir():
+            print(f"Error: {label} not found: {path}", file=sys.stderr)
+            print("Run check_repos.py --task schema-change to clone them.", file=sys.stderr)
+            return 1
+
+    cache_file = Path(args.cache_dir).expanduser() / "schema_drift.json"
+    cache = load_cache(cache_file)
+    stats = {"parsed": 0, "cached": 0}
+    glue_entries = scan_tree(glue_dir.resolve(), "glue", cache, stats)
+    druid_entries = scan_tree(druid_dir.resolve(), "druid", cache, stats)
+    save_cache(cache_file, {**glue_entries, **druid_entries})
+
+    tables = group_by_source(glue_entries)
+    datasources = group_by_source(druid_entries)
+    pairs = pair_sources(tables, datasources, args.pair)
+    reports = [compare(tables[t], datasources[d]) for t, d in pairs if t in tables and d in datasources]
+    for report in reports:
+        report["status"] = pair_status(report)
+    paired_t = {t for t, _ in pairs}
+    paired_d = {d for _, d in pairs}
+    unpaired = {
+        "tables": sorted(tables[k]["name"] for k in tables.keys() - paired_t),
+        "datasources": sorted(datasources[k]["name"] for k in datasources.keys() - paired_d),
+    }
+    errors = {p: e["error"] for p, e in {**glue_entries, **druid_entries}.items() if e.get("error")}
+    field_report = check_field(args.field, tables, datasources) if args.field else None
+
+    if args.json_output:
+        print(json.dumps({
+            "glue_dir": str(glue_dir),
+            "druid_dir": str(druid_dir),
+            "files": stats,
+            "pairs": reports,
+            "unpaired": unpaired,
+            "errors": errors,
+            "field": field_report,
+        }, indent=2))
+    else:
+        print(f"Parsed {stats['parsed']} file(s), {stats['cached']} from cache\n")
+        output_text(reports, unpaired, field_report)
+        for path, error in errors.items():
+            print(f"\n[ERROR] {path}: {error}")
+
+    has_drift = any(r["status"] != "OK" for r in reports) or errors
+    if field_report and (not field_report["tables"] or not field_report["datasources"]):
+        has_drift = True
+    return 1 if has_drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+CHANGELOG entry linter for Adplatform Guardian (Keep a Changelog + semver).
+
+Reads each CHANGELOG only from the top until the first released entry is fully
+parsed (it stops at the heading of the previous entry), so long CHANGELOGs cost
+a few kilobytes. The same bounded read is applied to the file at the git base
+(the merge-base with --base, as in helper.py), streamed from `git cat-file` and
+cut off early, to confirm a new entry was added.
+
+Checks the newest released entry:
+  - heading `## [X.Y.Z] - YYYY-MM-DD` (semantic version, valid date)
+  - version is a single major/minor/patch bump over the previous entry
+  - categories are Added/Changed/Deprecated/Removed/Fixed/Security, each with items
+  - items credit an author `[@username]`
+  - the version is new compared to the base
+
+Usage:
+    python changelog_lint.py                              # CHANGELOGs for uncommitted changes
+    python changelog_lint.py --base origin/master         # ... for the whole branch
+    python changelog_lint.py src/python/adp/modes/cmp_coordinator/CHANGELOG.md
+    python changelog_lint.py --json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from helper import (  # noqa: E402
+    CHANGELOG_NAME,
+    ChangelogIndex,
+    build_report,
+    changed_files,
+    detect_repo_name,
+    find_repo_root,
+    merge_base,
+)
+
+CATEGORIES = ["Added", "Changed", "Deprecated", "Removed", "Fixed", "Security"]
+
+ENTRY_HEADING = re.compile(r"^##(?!#)\s*(.*?)\s*$")
+BRACKETED = re.compile(r"^\[(?P<version>[^\]]+)\](?P<rest>.*)$")
+SEMVER = re.compile(r"^(\d+)\.(\d+)\.(\d+)$")
+DATE_SUFFIX = re.compile(r"^\s+-\s+(\d{4}-\d{2}-\d{2})$")
+CATEGORY_HEADING = re.compile(r"^###(?!#)\s*(.*?)\s*$")
+ITEM = re.compile(r"^[-*]\s+\S")
+AUTHOR = re.compile(r"\[@[\w.-]+\]")
+
+# Give up on files whose first entry does not end within this many bytes
+MAX_HEAD_BYTES = 256 * 1024
+
+
+def parse_version(text: str) -> Optional[Tuple[int, int, int]]:
+    match = SEMVER.match(text)
+    return tuple(int(p) for p in match.groups()) if match else None
+
+
+def bump_kind(previous: Tuple[int, int, int], current: Tuple[int, int, int]) -> Optional[str]:
+    """'major', 'minor' or 'patch' for a single-step bump, None otherwise."""
+    major, minor, patch = previous
+    if current == (major + 1, 0, 0):
+        return "major"
+    if current == (major, minor + 1, 0):
+        return "minor"
+    if current == (major, minor, patch + 1):
+        return "patch"
+    return None
+
+
+def parse_head(lines: Iterable[bytes], entries: int = 1) -> dict:
+    """Parse CHANGELOG lines from the top, stopping after `entries` released entries.
+
+    Returns the parsed entries (heading, version, date, categories with items), the
+    heading of the entry that follows (the previous release) and the bytes consumed.
+    An [Unreleased] section is parsed but does not count as a released entry.
+    """
+    head = {"unreleased": None, "entries": [], "previous": None, "bytes_read": 0, "truncated": False}
+    section = None
+    category = None
+
+    for number, raw in enumerate(lines, start=1):
+        head["bytes_read"] += len(raw)
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+        heading = ENTRY_HEADING.match(line)
+        if heading:
+            entry = _parse_heading(heading.group(1), number)
+            if len(head["entries"]) >= entries and not entry["unreleased"]:
+                head["previous"] = entry
+                break
+            if entry["unreleased"]:
+                head["unreleased"] = entry
+            else:
+                head["entries"].append(entry)
+            section, category = entry, None
+            continue
+
+        if section is None:
+            continue
+        cat = CATEGORY_HEADING.match(line)
+        if cat:
+            category = {"name": cat.group(1), "line": number, "items": []}
+            section["categories"].append(category)
+        elif ITEM.match(line):
+            item = {"line": number, "text": line[1:].strip()}
+            if category is None:
+                section["stray"].append(number)
+            else:
+                category["items"].append(item)
+        elif line.strip() and not line.startswith((" ", "\t")) and category is None:
+            section["stray"].append(number)
+
+        if head["bytes_read"] > MAX_HEAD_BYTES:
+            head["truncated"] = True
+            break
+
+    return head
+
+
+def _parse_heading(text: str, number: int) -> dict:
+    entry = {
+        "line": number,
+        "heading": text,
+        "version": None,
+        "date": None,
+        "unreleased": False,
+        "problems": [],
+        "categories": [],
+        "stray": [],
+    }
+    bracketed = BRACKETED.match(text)
+    if not bracketed:
+        entry["problems"].append(f"heading '## {text}' is not in the form '## [X.Y.Z] - YYYY-MM-DD'")
+        return entry
+    version, rest = bracketed.group("version").strip(), bracketed.group("rest")
+    if version.lower() == "unreleased":
+        entry["unreleased"] = True
+        return entry
+    entry["version"] = version
+    if parse_version(version) is None:
+        entry["problems"].append(f"version '{version}' is not semantic (MAJOR.MINOR.PATCH)")
+    suffix = DATE_SUFFIX.match(rest)
+    if not suffix:
+        entry["problems"].append("date missing or malformed, expected ' - YYYY-MM-DD' after the version")
+        return entry
+    try:
+        entry["date"] = date.fromisoformat(suffix.group(1)).isoformat()
+    except ValueError:
+        entry["problems"].append(f"'{suffix.group(1)}' is not a valid date")
+    return entry
+
+
+def read_worktree(path: Path, entries: int = 1) -> Optional[dict]:
+    """Bounded parse of a CHANGELOG in the working tree (None if it does not exist)."""
+    try:
+        with open(path, "rb") as f:
+            return parse_head(f, entries)
+    except FileNotFoundError:
+        return None
+
+
+def read_revision(repo_root: Path, rev: str, path: str, entries: int = 1) -> Optional[dict]:
+    """Bounded parse of a CHANGELOG at a git revision (None if it does not exist there).
+
+    The blob is streamed from `git cat-file` and the pipe is closed as soon as the
+    parse is done, so git stops writing the rest of the file.
+    """
+    try:
+        proc = subprocess.Popen(
+            ["git", "-C", str(repo_root), "cat-file", "-p", f"{rev}:{path}"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        return None
+    try:
+        head = parse_head(proc.stdout, entries)
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        returncode = proc.wait()
+    if head["bytes_read"] == 0 and returncode != 0:
+        return None
+    return head
+
+
+def lint_changelog(repo_root: Path, changelog: str, base: str = "HEAD",
+                   label: Optional[str] = None) -> dict:
+    """Lint the newest released entry of one CHANGELOG and compare it with the base.
+
+    `base` is the revision to compare with; `label` names it in messages.
+    """
+    label = label or base
+    issues: List[dict] = []
+
+    def issue(level: str, line: Optional[int], message: str) -> None:
+        issues.append({"level": level, "line": line, "message": message})
+
+    head = read_worktree(repo_root / changelog)
+    result = {"changelog": changelog, "issues": issues, "version": None, "previous": None,
+              "base_version": None, "bump": None, "bytes_read": 0}
+    if head is None:
+        issue("error", None, "file does not exist")
+        return result
+    result["bytes_read"] = head["bytes_read"]
+
+    if head["truncated"]:
+        issue("error", None, f"no complete released entry within the first {MAX_HEAD_BYTES // 1024} KB")
+    if not head["entries"]:
+        issue("error", None, "no released version entry ('## [X.Y.Z] - YYYY-MM-DD')")
+        return result
+
+    entry = head["entries"][0]
+    result["version"] = entry["version"]
+    for problem in entry["problems"]:
+        issue("error", entry["line"], problem)
+    _lint_categories(entry, issue)
+    if head["unreleased"]:
+        _lint_categories(head["unreleased"], issue, required=False)
+
+    current = parse_version(entry["version"] or "")
+    previous = head["previous"]
+    if previous:
+        result["previous"] = previous["version"]
+        prev_version = parse_version(previous["version"] or "")
+        if current and prev_version:
+            if current <= prev_version:
+                issue("error", entry["line"],
+                      f"version {entry['version']} is not greater than previous {previous['version']}")
+            else:
+                result["bump"] = bump_kind(prev_version, current)
+                if result["bump"] is None:
+                    issue("warning", entry["line"],
+                          f"{previous['version']} -> {entry['version']} skips versions "
+                          "(expected a single major, minor or patch bump)")
+        if entry["date"] and previous["date"] and entry["date"] < previous["date"]:
+            issue("warning", entry["line"],
+                  f"date {entry['date']} is earlier than the previous entry ({previous['date']})")
+    if entry["date"] and date.fromisoformat(entry["date"]) > date.today() + timedelta(days=1):
+        issue("warning", entry["line"], f"date {entry['date']} is in the future")
+
+    base_head = read_revision(repo_root, base, changelog)
+    if base_head is not None and base_head["entries"]:
+        base_version = base_head["entries"][0]["version"]
+        result["base_version"] = base_version
+        result["bytes_read"] += base_head["bytes_read"]
+        if base_version == entry["version"]:
+            issue("error", entry["line"], f"no new version entry since {label} (top is still {base_version})")
+        elif previous and previous["version"] != base_version:
+            issue("warning", entry["line"],
+                  f"previous entry {previous['version']} is not the top version at {label} "
+                  f"({base_version}); add exactly one entry per change")
+
+    issues.sort(key=lambda i: i["line"] or 0)
+    return result
+
+
+def _lint_categories(entry: dict, issue, required: bool = True) -> None:
+    """Allowed, non-empty, non-duplicated categories with attributed items."""
+    label = "[Unreleased]" if entry["unreleased"] else f"[{entry['version']}]"
+    if not entry["categories"] and required:
+        issue("error", entry["line"], f"{label} has no '### <Category>' section")
+    seen = set()
+    for category in entry["categories"]:
+        name = category["name"]
+        if name not in CATEGORIES:
+            suggestion = next((c for c in CATEGORIES if c.lower() == name.lower()), None)
+            hint = f" (use '{suggestion}')" if suggestion else f" (allowed: {', '.join(CATEGORIES)})"
+            issue("error", category["line"], f"unknown category '{name}'{hint}")
+        if name in seen:
+            issue("warning", category["line"], f"category '{name}' appears twice in {label}")
+        seen.add(name)
+        if not category["items"]:
+            issue("error", category["line"], f"category '{name}' has no items")
+        for item in category["items"]:
+            if not AUTHOR.search(item["text"]):
+                issue("warning", item["line"], "item does not credit an author ([@username])")
+    for number in entry["stray"]:
+        issue("warning", number, f"text outside a '### <Category>' section in {label}")
+
+
+def changelogs_for_changes(repo_root: Path, repo_name: Optional[str], base: Optional[str]) -> List[str]:
+    """Existing CHANGELOGs required by, or edited in, the current changes."""
+    index = ChangelogIndex(repo_root, repo_name or detect_repo_name(repo_root))
+    files = changed_files(repo_root, base)
+    report = build_report(index, files, base)
+    selected = {c for c, info in report["changelogs"].items() if info["status"] != "absent"}
+    selected.update(f for f in files if Path(f).name == CHANGELOG_NAME and (repo_root / f).is_file())
+    return sorted(selected)
+
+
+def output_text(results: List[dict], base: str) -> None:
+    """Print lint results as human-readable text."""
+    if not results:
+        print("No CHANGELOGs to lint.")
+        return
+    total_bytes = 0
+    for result in results:
+        total_bytes += result["bytes_read"]
+        errors = [i for i in result["issues"] if i["level"] == "error"]
+        label = "[ERROR]" if errors else "[WARN]" if result["issues"] else "[OK]"
+        detail = result["version"] or "-"
+        if result["previous"]:
+            detail += f" (from {result['previous']}"
+            detail += f", {result['bump']})" if result["bump"] else ")"
+        print(f"{label} {result['changelog']}: {detail}")
+        for item in result["issues"]:
+            icon = "✗" if item["level"] == "error" else "⚠"
+            where = f"line {item['line']}: " if item["line"] else ""
+            print(f"     {icon} {where}{item['message']}")
+    print(f"\nCompared against {base}; read {total_bytes / 1024:.1f} KB in total.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Adplatform Guardian - lint the newest CHANGELOG entries (bounded read)"
+    )
+    parser.add_argument("changelogs", nargs="*",
+                        help="CHANGELOG files (default: those required by the current changes)")
+    parser.add_argument(
+        "--repo",
+        type=str,
+        default=os.getcwd(),
+        help="Path inside the repository (default: current directory)",
+    )
+    parser.add_argument("--base", type=str,
+                        help="Branch the new entry must be missing from, compared at its merge-base "
+                             "with HEAD (default: HEAD)")
+    parser.add_argument("--repo-name", type=str, help="Override detected repository name")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    repo_root = find_repo_root(Path(args.repo).resolve())
+    if repo_root is None:
+        print(f"Error: not a git repository: {args.repo}", file=sys.stderr)
+        return 1
+
+    if args.changelogs:
+        changelogs = []
+        for c in args.changelogs:
+            path = Path(c)
+            if path.is_absolute() or path.exists():
+                try:
+                    c = str(path.resolve().relative_to(repo_root))
+                except ValueError:
+                    print(f"Warning: {c} is outside {repo_root}", file=sys.stderr)
+                    continue
+            changelogs.append(c)
+    else:
+        changelogs = changelogs_for_changes(repo_root, args.repo_name, args.base)
+
+    base, label = "HEAD", "HEAD"
+    if args.base:
+        # Entries released on the base branch since the fork are not ours to lint
+        base = merge_base(repo_root, args.base)
+        if base is None:
+            print(f"Error: unknown base ref (no merge-base with HEAD): {args.base}", file=sys.stderr)
+            return 1
+        label = f"the merge-base with {args.base}"
+    results = [lint_changelog(repo_root, c, base, label) for c in changelogs]
+
+    if args.json_output:
+        print(json.dumps({
+            "repo": str(repo_root),
+            "base": args.base or "HEAD",
+            "merge_base": base if args.base else None,
+            "changelogs": results,
+        }, indent=2))
+    else:
+        output_text(results, label)
+
+    failing = {"error", "warning"} if args.strict else {"error"}
+    return 1 if any(i["level"] in failing for r in results for i in r["issues"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Diff-scoped coverage for the guardian's test requirement.
+
+Streams coverage reports (Cobertura XML via expat, lcov, Go cover profiles;
+optionally gzipped) and keeps line data only for files touched by the current
+diff, so report size does not matter. The changed lines are intersected with the
+instrumented lines to report uncovered new lines per file and a pass/fail
+against a threshold. Changed sources missing from every report count as
+uncovered (their changed non-blank, non-comment lines), so a module that no test
+imports fails the check; --ignore-missing leaves them out of the total instead.
+
+Usage:
+    python coverage_delta.py coverage.xml                     # uncommitted changes vs HEAD
+    python coverage_delta.py coverage.xml --base origin/master --threshold 90
+    python coverage_delta.py lcov.info cover.out --json
+    git diff origin/master | python coverage_delta.py coverage.xml --diff -
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from xml.parsers import expat
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from helper import find_repo_root, git, git_ranges, parse_diff  # noqa: E402
+from test_impact import GO_MODULE, is_test  # noqa: E402
+
+DEFAULT_THRESHOLD = 80.0
+
+# Changed files that coverage reports can know about
+SOURCE_SUFFIXES = (".py", ".go", ".js", ".jsx", ".ts", ".tsx", ".java")
+
+# Lines of an unmeasured file that are not counted as code
+COMMENT_PREFIXES = ("#", "//", "/*", "*", "*/")
+
+GO_BLOCK = re.compile(r"^(.+):(\d+)\.\d+,(\d+)\.\d+ (\d+) (\d+)$")
+
+# path -> {line: hits}
+LineHits = Dict[str, Dict[int, int]]
+
+
+def open_report(path: str):
+    """Binary stream for a report file (gzip-aware, '-' for stdin)."""
+    if path == "-":
+        return sys.stdin.buffer
+    handle = open(path, "rb")
+    if handle.read(2) == b"\x1f\x8b":
+        handle.close()
+        return gzip.open(path, "rb")
+    handle.seek(0)
+    return handle
+
+
+def detect_format(path: str) -> str:
+    """cobertura, lcov or go, from the first bytes of the report."""
+    with open_report(path) as f:
+        head = f.read(4096).decode("utf-8", errors="replace").lstrip()
+    if head.startswith("<"):
+        return "cobertura"
+    if head.startswith("mode:"):
+        return "go"
+    if re.search(r"^(TN|SF):", head, re.M):
+        return "lcov"
+    raise ValueError(f"unrecognised coverage format: {path} (use --format)")
+
+
+class PathMatcher:
+    """Map report file names to changed repo-relative paths (cached per name)."""
+
+    def __init__(self, repo_root: Path, changed: Set[str]):
+        self.repo_root = repo_root
+        self.changed = changed
+        self.sources: List[str] = []
+        self.go_modules: List[Tuple[str, str]] = []
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def load_go_modules(self) -> None:
+        """Module path -> directory, from every go.mod in the repository (longest first)."""
+        modules = []
+        for gomod in git(self.repo_root, "ls-files", "go.mod", "*/go.mod").splitlines():
+            try:
+                match = GO_MODULE.search((self.repo_root / gomod).read_text(errors="replace"))
+            except OSError:
+                continue
+            if match:
+                directory = os.path.dirname(gomod)
+                modules.append((match.group(1), directory))
+        self.go_modules = sorted(modules, key=lambda m: len(m[0]), reverse=True)
+
+    def resolve(self, name: str) -> Optional[str]:
+        if name not in self._cache:
+            self._cache[name] = self._resolve(name)
+        return self._cache[name]
+
+    def _resolve(self, name: str) -> Optional[str]:
+        name = name.replace("\\", "/")
+        candidates = [name]
+        if os.path.isabs(name):
+            try:
+                candidates.append(str(Path(name).relative_to(self.repo_root)))
+            except ValueError:
+                pass
+        for source in self.sources:
+            candidates.append(os.path.normpath(os.path.join(source, name)))
+        for module, directory in self.go_modules:
+            if name.startswith(module + "/"):
+                candidates.append(os.path.join(directory, name[len(module) + 1:]))
+        for candidate in candidates:
+            if candidate in self.changed:
+                return candidate
+        # Reports produced elsewhere (CI checkouts, per-project roots): match on path suffix.
+        # Changed paths that are suffixes of the report name nest, so the longest is the
+        # file; any other combination of several matches is ambiguous.
+        inside = [path for path in self.changed if name.endswith("/" + path)]
+        around = [path for path in self.changed if path.endswith("/" + name)]
+        if len(around) > 1 or (around and inside):
+            print(f"Warning: report file {name} matches several changed files "
+                  f"({', '.join(sorted(around + inside))}); ignoring it", file=sys.stderr)
+            return None
+        if around:
+            return around[0]
+        return max(inside, key=len) if inside else None
+
+
+def _record(hits: LineHits, path: str, line: int, count: int) -> None:
+    lines = hits.setdefault(path, {})
+    lines[line] = max(lines.get(line, 0), count)
+
+
+def parse_cobertura(stream, matcher: PathMatcher, hits: LineHits) -> None:
+    """Class-level <line> hits from expat callbacks; no element tree is built."""
+    state = {"current": None, "in_method": 0, "source": None}
+    sources: List[str] = []
+
+    def start(tag: str, attrs: dict) -> None:
+        if tag == "line":
+            if state["current"] and not state["in_method"]:
+                _record(hits, state["current"], int(attrs.get("number", 0)), int(attrs.get("hits", 0)))
+        elif tag == "class":
+            state["current"] = matcher.resolve(attrs.get("filename", ""))
+        elif tag == "method":
+            state["in_method"] += 1
+        elif tag == "source":
+            state["source"] = []
+
+    def end(tag: str) -> None:
+        if tag == "method":
+            state["in_method"] -= 1
+        elif tag == "class":
+            state["current"] = None
+        elif tag == "source" and state["source"] is not None:
+            source = "".join(state["source"]).strip()
+            state["source"] = None
+            try:
+                source = str(Path(source).relative_to(matcher.repo_root))
+            except ValueError:
+                pass
+            sources.append(source)
+            matcher.sources = sources
+
+    def text(data: str) -> None:
+        if state["source"] is not None:
+            state["source"].append(data)
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = text
+    parser.ParseFile(stream)
+
+
+def parse_lcov(stream, matcher: PathMatcher, hits: LineHits) -> None:
+    """SF:/DA: records, line by line."""
+    current: Optional[str] = None
+    for raw in stream:
+        line = raw.decode("utf-8", errors="replace").strip()
+        if line.startswith("SF:"):
+            current = matcher.resolve(line[3:])
+        elif line.startswith("DA:") and current:
+            parts = line[3:].split(",")
+            if len(parts) >= 2:
+                try:
+                    _record(hits, current, int(parts[0]), int(float(parts[1])))
+                except ValueError:
+                    continue
+        elif line == "end_of_record":
+            current = None
+
+
+def parse_go(stream, matcher: PathMatcher, hits: LineHits) -> None:
+    """Go cover profile blocks; a line is covered if any block spanning it ran."""
+    if not matcher.go_modules:
+        matcher.load_go_modules()
+    for raw in stream:
+        match = GO_BLOCK.match(raw.decode("utf-8", errors="replace").strip())
+        if not match:
+            continue  # "mode: ..." header
+        path = matcher.resolve(match.group(1))
+        if path is None:
+            continue
+        count = int(match.group(5))
+        for line in range(int(match.group(2)), int(match.group(3)) + 1):
+            _record(hits, path, line, count)
+
+
+PARSERS = {"cobertura": parse_cobertura, "lcov": parse_lcov, "go": parse_go}
+
+
+def to_ranges(lines: List[int]) -> List[Tuple[int, int]]:
+    """Collapse sorted line numbers into (start, end) runs."""
+    runs: List[Tuple[int, int]] = []
+    for line in lines:
+        if runs and runs[-1][1] == line - 1:
+            runs[-1] = (runs[-1][0], line)
+        else:
+            runs.append((line, line))
+    return runs
+
+
+def changed_lines(ranges: List[Tuple[int, int]]) -> Iterator[int]:
+    for start, end in ranges:
+        yield from range(start, end + 1)
+
+
+def code_lines(path: Path, ranges: Optional[List[Tuple[int, int]]]) -> List[int]:
+    """Changed lines of a file with no coverage data that look like code (not blank or comments)."""
+    try:
+        text = path.read_text(errors="replace").splitlines()
+    except OSError:
+        return []
+    numbers = range(1, len(text) + 1) if ranges is None else changed_lines(ranges)
+    return [n for n in numbers
+            if n <= len(text) and text[n - 1].strip() and not text[n - 1].strip().startswith(COMMENT_PREFIXES)]
+
+
+def build_report(ranges: Dict[str, Optional[List[Tuple[int, int]]]], hits: LineHits,
+                 threshold: float, repo_root: Path, ignore_missing: bool = False) -> dict:
+    """Per-file changed/covered/uncovered lines and the overall verdict.
+
+    Files absent from the reports count as fully uncovered unless ignore_missing;
+    a run with changed sources but no coverage data for any of them fails.
+    """
+    files = {}
+    not_measured = []
+    total = covered = 0
+    for path in sorted(ranges):
+        file_hits = hits.get(path)
+        if file_hits is None:
+            not_measured.append(path)
+            if ignore_missing:
+                continue
+            lines = code_lines(repo_root / path, ranges[path])
+            uncovered = lines
+        else:
+            lines = sorted(file_hits) if ranges[path] is None else \
+                [n for n in changed_lines(ranges[path]) if n in file_hits]
+            uncovered = [n for n in lines if file_hits[n] == 0]
+        if not lines:
+            continue  # only non-executable lines changed
+        files[path] = {
+            "changed": len(lines),
+            "covered": len(lines) - len(uncovered),
+            "uncovered": ["%d-%d" % r if r[0] != r[1] else str(r[0]) for r in to_ranges(uncovered)],
+            "measured": file_hits is not None,
+        }
+        total += len(lines)
+        covered += len(lines) - len(uncovered)
+
+    percent = round(100.0 * covered / total, 1) if total else None
+    # No executable changed lines is only a pass when the reports did cover the changed files
+    no_data = percent is None and bool(not_measured)
+    return {
+        "threshold": threshold,
+        "changed_lines": total,
+        "covered_lines": covered,
+        "percent": percent,
+        "passed": not no_data if percent is None else percent >= threshold,
+        "no_data": no_data,
+        "files": files,
+        "not_measured": not_measured,
+    }
+
+
+def output_text(report: dict) -> None:
+    """Print the coverage delta as human-readable text."""
+    for path, info in report["files"].items():
+        if not info["measured"]:
+            print(f"[NO DATA] {path}: not in the coverage report, "
+                  f"{info['changed']} changed line(s) counted as uncovered")
+            continue
+        label = "[OK]" if not info["uncovered"] else "[UNCOVERED]" if info["covered"] == 0 else "[PARTIAL]"
+        print(f"{label} {path}: {info['covered']}/{info['changed']} changed line(s) covered")
+        if info["uncovered"]:
+            print(f"     └─ uncovered: {', '.join(info['uncovered'])}")
+    for path in report["not_measured"]:
+        if path not in report["files"]:
+            print(f"[NO DATA] {path} (not in the coverage report)")
+
+    if report["no_data"]:
+        print("\nNo coverage data for any changed source file - FAIL")
+        return
+    if report["percent"] is None:
+        print("\nNo executable changed lines found in the coverage report.")
+        return
+    verdict = "PASS" if report["passed"] else "FAIL"
+    print(f"\nChanged-line coverage: {report['covered_lines']}/{report['changed_lines']} "
+          f"({report['percent']}%), threshold {report['threshold']}% - {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Adplatform Guardian - coverage of changed lines from streamed coverage reports"
+    )
+    parser.add_argument("reports", nargs="+", help="Cobertura XML, lcov or Go cover profiles (.gz ok)")
+    parser.add_argument(
+        "--repo",
+        type=str,
+        default=os.getcwd(),
+        help="Path inside the repository (default: current directory)",
+    )
+    parser.add_argument("--base", type=str, help="Also include committed changes since this ref")
+    parser.add_argument("--diff", metavar="PATCH",
+                        help="Unified diff to take changed lines from ('-' for stdin)")
+    parser.add_argument("--format", choices=sorted(PARSERS), help="Report format (default: detected)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum %% of changed executable lines covered (default: {DEFAULT_THRESHOLD:g})")
+    parser.add_argument("--include-tests", action="store_true", help="Also measure changed test files")
+    parser.add_argument("--strict", action="store_true",
+                        help="Fail on any changed source file missing from the report")
+    parser.add_argument("--ignore-missing", action="store_true",
+                        help="Leave files missing from the report out of the total instead of "
+                             "counting them as uncovered")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    repo_root = find_repo_root(Path(args.repo).resolve())
+    if repo_root is None:
+        print(f"Error: not a git repository: {args.repo}", file=sys.stderr)
+        return 1
+
+    if args.diff:
+        text = sys.stdin.read() if args.diff == "-" else Path(args.diff).read_text()
+        ranges: Dict[str, Optional[List[Tuple[int, int]]]] = dict(parse_diff(text))
+    else:
+        ranges = dict(git_ranges(repo_root, args.base))
+        # Untracked files are new in full
+        for f in git(repo_root, "ls-files", "--others", "--exclude-standard").splitlines():
+            ranges.setdefault(f, None)
+    ranges = {
+        path: r for path, r in ranges.items()
+        if r != [] and path.endswith(SOURCE_SUFFIXES) and (args.include_tests or not is_test(path)) and (repo_root / path).is_file()
+    }
+
+    if "-" in args.reports and not args.format:
+        parser.error("--format is required when reading a report from stdin")
+
+    matcher = PathMatcher(repo_root, set(ranges))
+    hits: LineHits = {}
+    for report_path in args.reports:
+        try:
+            fmt = args.format or detect_format(report_path)
+            with open_report(report_path) as stream:
+                PARSERS[fmt](stream, matcher, hits)
+        except (OSError, ValueError, expat.ExpatError) as e:
+            print(f"Error: {report_path}: {e}", file=sys.stderr)
+            return 1
+
+    report = build_report(ranges, hits, args.threshold, repo_root, args.ignore_missing)
+    report["repo"] = str(repo_root)
+    if args.json_output:
+        print(json.dumps(report, indent=2))
+    else:
+        output_text(report)
+
+    if not report["passed"]:
+        return 1
+    return 1 if args.strict and report["not_measured"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Thin client for the resident Adplatform Guardian service (guardian_daemon.py).
+
+Sends one request over the Unix socket and prints the answer. Starts the service
+in the background if it is not running; with --no-spawn it falls back to the
+one-shot helper.py instead.
+
+The service rebuilds its state when the git index or HEAD moves; unstaged and
+untracked edits are seen through the files being checked (their CHANGELOGs are
+stat()ed and read from the work tree on every check).
+
+Usage:
+    python guardian_client.py check path/to/edited_file.py [more files...]
+    python guardian_client.py check --base origin/master --json
+    python guardian_client.py stats
+    python guardian_client.py stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or Path.home() / ".cache" / "claude-toolkit") \
+    / "adplatform-guardian.sock"
+SPAWN_TIMEOUT = 3.0
+
+STATUS_LABELS = {
+    "updated": "[OK]",
+    "missing": "[MISSING]",
+    "absent": "[NO FILE]",
+}
+
+
+def request(socket_path: Path, payload: dict, timeout: float = 5.0) -> dict:
+    """Send one JSON request and read one JSON response line."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def spawn(socket_path: Path) -> bool:
+    """Start the service detached and wait for its socket."""
+    subprocess.Popen(
+        [sys.executable, str(SCRIPTS_DIR / "guardian_daemon.py"), "--socket", str(socket_path)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return request(socket_path, {"op": "ping"}, timeout=0.5).get("ok", False)
+        except (OSError, ValueError):
+            time.sleep(0.05)
+    return False
+
+
+def fallback(args: argparse.Namespace) -> int:
+    """Run the one-shot helper when the service is unavailable."""
+    cmd = [sys.executable, str(SCRIPTS_DIR / "helper.py"), "--repo", args.repo]
+    if args.base:
+        cmd += ["--base", args.base]
+    if args.json_output:
+        cmd.append("--json")
+    return subprocess.call(cmd + args.files)
+
+
+def output_text(result: dict) -> None:
+    """Print a check result as human-readable text."""
+    for changelog, info in result["changelogs"].items():
+        print(f"{STATUS_LABELS.get(info['status'], info['status'])} {changelog}")
+        for path in info["files"][:3]:
+            print(f"     └─ {path}")
+    for path in result["unresolved"]:
+        print(f"[UNRESOLVED] {path}")
+    if result["missing"]:
+        print(f"{len(result['missing'])} CHANGELOG(s) need a new version entry.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client for the resident Adplatform Guardian service")
+    parser.add_argument("command", choices=["check", "stats", "ping", "stop"], help="Request to send")
+    parser.add_argument("files", nargs="*", help="Edited files (check; default: changed files from git)")
+    parser.add_argument("--repo", type=str, default=os.getcwd(), help="Path inside the repository")
+    parser.add_argument("--base", type=str, help="With no files: include committed changes since this ref")
+    parser.add_argument("--socket", type=str, default=str(DEFAULT_SOCKET), help="Unix socket path")
+    parser.add_argument("--no-spawn", action="store_true", help="Do not start the service; fall back to helper.py")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_intermixed_args()
+
+    socket_path = Path(args.socket).expanduser()
+    op = "shutdown" if args.command == "stop" else args.command
+    payload = {"op": op}
+    if op == "check":
+        payload.update(
+            repo=str(Path(args.repo).resolve()),
+            files=[os.path.abspath(f) for f in args.files],
+            base=args.base,
+        )
+
+    try:
+        result = request(socket_path, payload)
+    except (OSError, ValueError):
+        if op in ("shutdown", "ping", "stats"):
+            print("Guardian service is not running.", file=sys.stderr)
+            return 1
+        if args.no_spawn or not spawn(socket_path):
+            return fallback(args)
+        result = request(socket_path, payload)
+
+    if not result.get("ok"):
+        print(f"Error: {result.get('error')}", file=sys.stderr)
+        return 1
+
+    if args.json_output or op != "check":
+        print(json.dumps(result, indent=2))
+    else:
+        output_text(result)
+
+    return 1 if op == "check" and result["missing"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Resident Adplatform Guardian service on a local Unix socket.
+
+Keeps per-repository state warm between edits: the CHANGELOG rule set and prefix
+index (see helper.py) and the released version at the top of every CHANGELOG in
+HEAD (and at the merge-base of each requested base ref). A watcher thread polls
+each repository's git index and HEAD and rebuilds state only when they move.
+Work-tree edits move neither, so the directories of every checked file are
+stat()ed for untracked CHANGELOGs created or deleted since, and CHANGELOG contents
+are always read from the work tree. Checks for explicit files without a base are
+answered from memory without spawning git.
+
+One service runs per socket (guarded by a lock file next to it); it exits after
+--idle-timeout minutes without requests.
+
+Use guardian_client.py to talk to it; the client starts the service on demand.
+
+Protocol: one JSON object per line in each direction.
+    {"op": "check", "repo": "/abs/path/inside/repo", "files": ["a/b.py", ...]}
+    {"op": "check", "repo": "...", "base": "origin/master"}   (files from git)
+    {"op": "ping"} | {"op": "stats"} | {"op": "shutdown"}
+
+Usage:
+    python guardian_daemon.py [--socket PATH] [--poll-interval 2.0] [--idle-timeout 30]
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from helper import (  # noqa: E402
+    ChangelogIndex, changed_files, detect_repo_name, find_repo_root, git, is_ignored, merge_base,
+)
+
+DEFAULT_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or Path.home() / ".cache" / "claude-toolkit") \
+    / "adplatform-guardian.sock"
+
+# Only the head of a CHANGELOG is needed to find the latest version
+VERSION_RE = re.compile(r"^##\s*\[(\d+\.\d+\.\d+)\]", re.M)
+HEAD_BYTES = 16384
+
+DEFAULT_IDLE_TIMEOUT_MIN = 30.0
+
+
+def top_version(text: str) -> Optional[str]:
+    """First released version heading in CHANGELOG text."""
+    match = VERSION_RE.search(text)
+    return match.group(1) if match else None
+
+
+def head_versions(repo_root: Path, paths: List[str], rev: str = "HEAD") -> Dict[str, Optional[str]]:
+    """Top version of each CHANGELOG at rev, read through one `git cat-file --batch`.
+
+    CHANGELOGs that do not exist at rev are left out.
+    """
+    if not paths:
+        return {}
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_root), "cat-file", "--batch"],
+            input="".join(f"{rev}:{p}\n" for p in paths).encode(),
+            capture_output=True,
+        )
+    except FileNotFoundError:
+        return {}
+    out, pos, versions = result.stdout, 0, {}
+    for path in paths:
+        end = out.find(b"\n", pos)
+        if end == -1:
+            break
+        header = out[pos:end].split()
+        pos = end + 1
+        if len(header) != 3:  # "<ref> missing"
+            continue
+        size = int(header[2])
+        versions[path] = top_version(out[pos:pos + min(size, HEAD_BYTES)].decode(errors="replace"))
+        pos += size + 1
+    return versions
+
+
+class RepoState:
+    """Warm state for one repository."""
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = repo_root
+        self.repo_name = detect_repo_name(repo_root)
+        git_dir = git(repo_root, "rev-parse", "--absolute-git-dir").strip()
+        self.git_dir = Path(git_dir) if git_dir else repo_root / ".git"
+        self.lock = threading.Lock()
+        self.signature = None
+        self.index: Optional[ChangelogIndex] = None
+        self.changelogs: List[str] = []
+        self.tracked_changelogs: set = set()
+        self.head_versions: Dict[str, Optional[str]] = {}
+        # merge-base commit -> top versions at that commit (immutable per commit)
+        self.base_versions: Dict[str, Dict[str, Optional[str]]] = {}
+        self.rebuilds = 0
+        self.refresh(force=True)
+
+    def _signature(self):
+        """Cheap fingerprint of the git index and HEAD ref."""
+        sig = []
+        for name in ("index", "HEAD"):
+            try:
+                st = (self.git_dir / name).stat()
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+        head = (self.git_dir / "HEAD")
+        try:
+            ref = head.read_text().strip()
+            if ref.startswith("ref: "):
+                st = (self.git_dir / ref[5:]).stat()
+                sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+        return tuple(sig)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the CHANGELOG map and HEAD versions if the git index or HEAD moved."""
+        signature = self._signature()
+        if not force and signature == self.signature:
+            return False
+        files = set(git(self.repo_root, "ls-files").splitlines())
+        tracked = [f for f in files if f.endswith("CHANGELOG.md")]
+        changelogs = list(tracked)
+        untracked = git(self.repo_root, "ls-files", "--others", "--exclude-standard", "*CHANGELOG.md")
+        changelogs.extend(f for f in untracked.splitlines() if f)
+        index = ChangelogIndex(self.repo_root, self.repo_name, changelogs)
+        versions = head_versions(self.repo_root, [c for c in changelogs if c in files])
+        with self.lock:
+            self.index, self.head_versions = index, versions
+            self.changelogs, self.tracked_changelogs = changelogs, set(tracked)
+            self.base_versions = {}
+            self.signature = signature
+            self.rebuilds += 1
+        return True
+
+    def sync_work_tree(self, path: str) -> None:
+        """Stat the CHANGELOG in each directory above path and update the index to match.
+
+        Picks up CHANGELOGs created or deleted in the work tree, which leave the git
+        index and HEAD (and so the watcher's signature) untouched. Like helper.py,
+        a deleted tracked CHANGELOG stays indexed and is reported as absent.
+        """
+        directory = os.path.dirname(path)
+        while True:
+            changelog = os.path.join(directory, "CHANGELOG.md")
+            exists = (self.repo_root / changelog).is_file()
+            with self.lock:
+                known = self.index.by_dir.get(directory) == changelog
+                if exists and not known:
+                    self.index.add_changelog(changelog)
+                    self.changelogs.append(changelog)
+                elif known and not exists and changelog not in self.tracked_changelogs:
+                    self.index.remove_changelog(changelog)
+                    self.changelogs.remove(changelog)
+            if not directory:
+                return
+            directory = os.path.dirname(directory)
+
+    def versions_at(self, base: Optional[str]) -> Dict[str, Optional[str]]:
+        """Top CHANGELOG versions at HEAD, or at the merge-base of HEAD and base.
+
+        Matches helper.py, which diffs against the same merge-base. Raises ValueError
+        for an unknown base ref.
+        """
+        if not base:
+            return self.head_versions
+        commit = merge_base(self.repo_root, base)
+        if commit is None:
+            raise ValueError(f"unknown base ref (no merge-base with HEAD): {base}")
+        with self.lock:
+            versions = self.base_versions.get(commit)
+            changelogs = list(self.changelogs)
+        if versions is None:
+            versions = head_versions(self.repo_root, changelogs, rev=commit)
+            with self.lock:
+                self.base_versions[commit] = versions
+        return versions
+
+    def changelog_status(self, changelog: str, versions: Dict[str, Optional[str]]) -> str:
+        """updated (new top version vs `versions`), missing, or absent."""
+        try:
+            with open(self.repo_root / changelog, "r", errors="replace") as f:
+                current = top_version(f.read(HEAD_BYTES))
+        except OSError:
+            return "absent"
+        if current is None:
+            return "missing"
+        if changelog not in versions:
+            return "updated"  # new CHANGELOG with a version entry
+        return "updated" if current != versions[changelog] else "missing"
+
+    def check(self, files: List[str], base: Optional[str] = None) -> dict:
+        """Resolve files to CHANGELOGs and report their status against HEAD or base."""
+        versions = self.versions_at(base)
+        changelogs: Dict[str, dict] = {}
+        unresolved = []
+        for path in files:
+            self.sync_work_tree(path)
+            if is_ignored(path):
+                continue
+            with self.lock:
+                changelog, how = self.index.resolve(path)
+            if changelog is None:
+                unresolved.append(path)
+                continue
+            entry = changelogs.setdefault(changelog, {"files": [], "resolved_by": how})
+            entry["files"].append(path)
+        for changelog, entry in changelogs.items():
+            entry["status"] = self.changelog_status(changelog, versions)
+        return {
+            "repo": str(self.repo_root),
+            "repo_name": self.repo_name,
+            "changelogs": changelogs,
+            "unresolved": unresolved,
+            "missing": sorted(c for c, e in changelogs.items() if e["status"] != "updated"),
+        }
+
+
+class GuardianState:
+    """All repositories seen by the service, plus the polling watcher."""
+
+    def __init__(self, poll_interval: float, idle_timeout: float = 0):
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.repos: Dict[Path, RepoState] = {}
+        self.roots: Dict[str, Path] = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.last_request = time.monotonic()
+        self.requests = 0
+        self.stop = threading.Event()
+
+    def repo_for(self, path: str) -> Optional[RepoState]:
+        """RepoState for a path inside a repository (repo root lookups are cached)."""
+        root = self.roots.get(path)
+        if root is None:
+            root = find_repo_root(Path(path))
+            if root is None:
+                return None
+            self.roots[path] = root
+        with self.lock:
+            state = self.repos.get(root)
+            if state is None:
+                state = self.repos[root] = RepoState(root)
+        return state
+
+    def watch(self) -> None:
+        """Poll git index/HEAD of known repos and refresh state on change; stop when idle."""
+        while not self.stop.wait(self.poll_interval):
+            if self.idle_timeout and time.monotonic() - self.last_request > self.idle_timeout:
+                self.stop.set()
+                return
+            for state in list(self.repos.values()):
+                try:
+                    state.refresh()
+                except Exception as e:  # keep the watcher alive
+                    print(f"Watcher error for {state.repo_root}: {e}", file=sys.stderr)
+
+    def handle(self, request: dict) -> dict:
+        """Dispatch one request."""
+        self.requests += 1
+        self.last_request = time.monotonic()
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if op == "stats":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "repos": {
+                    str(root): {"changelogs": len(s.index.by_dir), "rebuilds": s.rebuilds}
+                    for root, s in self.repos.items()
+                },
+            }
+        if op == "check":
+            start = time.perf_counter()
+            state = self.repo_for(request.get("repo") or os.getcwd())
+            if state is None:
+                return {"ok": False, "error": f"not a git repository: {request.get('repo')}"}
+            requested = request.get("files") or []
+            files = [self._relative(state.repo_root, f) for f in requested]
+            outside = [f for f, rel in zip(requested, files) if rel is None]
+            if outside:
+                return {"ok": False, "error": f"not inside {state.repo_root}: {', '.join(outside)}"}
+            if not files:
+                files = changed_files(state.repo_root, request.get("base"))
+            result = state.check(files, request.get("base"))
+            result["ok"] = True
+            result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            return result
+        if op == "shutdown":
+            self.stop.set()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    @staticmethod
+    def _relative(repo_root: Path, path: str) -> Optional[str]:
+        """Repo-relative form of path, or None if it lies outside the repository."""
+        if not os.path.isabs(path):
+            return path
+        try:
+            return str(Path(path).relative_to(repo_root))
+        except ValueError:
+            return None
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        state: GuardianState = self.server.state
+        for line in self.rfile:
+            try:
+                response = state.handle(json.loads(line))
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if state.stop.is_set():
+                return
+
+
+class GuardianServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def socket_alive(socket_path: Path) -> bool:
+    """Whether a service is accepting connections on the socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1.0)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(socket_path: Path, poll_interval: float, idle_timeout: float) -> int:
+    """Run the service until shutdown or idle timeout (0 disables it).
+
+    Exits immediately if another service holds the socket's lock file or answers
+    on the socket, so concurrent spawns leave exactly one service running.
+    """
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(socket_path.with_name(socket_path.name + ".lock"), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"Guardian already running on {socket_path}", file=sys.stderr)
+        return 0
+    if socket_alive(socket_path):
+        print(f"Guardian already running on {socket_path}", file=sys.stderr)
+        return 0
+    if socket_path.exists():
+        socket_path.unlink()  # stale socket from a previous run
+    state = GuardianState(poll_interval, idle_timeout)
+    server = GuardianServer(str(socket_path), Handler)
+    os.chmod(socket_path, 0o600)
+    server.state = state
+    threading.Thread(target=state.watch, daemon=True).start()
+
+    def stop_server():
+        state.stop.wait()
+        server.shutdown()
+
+    threading.Thread(target=stop_server, daemon=True).start()
+    print(f"Guardian listening on {socket_path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state.stop.set()
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+        lock_file.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident Adplatform Guardian service")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=str(DEFAULT_SOCKET),
+        help=f"Unix socket path (default: {DEFAULT_SOCKET})",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between git index/HEAD checks (default: 2.0)",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT_MIN,
+        help=f"Exit after this many minutes without requests, 0 to never exit "
+             f"(default: {DEFAULT_IDLE_TIMEOUT_MIN:g})",
+    )
+    args = parser.parse_args()
+    return serve(Path(args.socket).expanduser(), args.poll_interval, args.idle_timeout * 60)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,369 @@
 #!/usr/bin/env python3
 """
-Helper script for Adplatform Guardian.
+Helper script for Adplatform Guardian: resolve changed files to required CHANGELOGs.
+
+Takes the changed-file list from git (or from arguments), resolves each file to the
+CHANGELOG it must be recorded in using the repository rules from SKILL.md, and
+reports which CHANGELOGs are missing a new entry.
+
+Resolution uses a path-prefix index built once from `git ls-files` (every
+directory that holds a CHANGELOG.md), so each file is resolved by walking at most
+its own parent directories instead of searching the repo.
+
+With --base, CHANGELOGs are diffed against the merge-base of HEAD and the base
+ref, so versions released on the base branch after the fork do not count as
+this branch's entry (guardian_daemon.py and changelog_lint.py do the same).
 
 Usage:
-    python helper.py <args>
+    python helper.py                          # uncommitted changes vs HEAD
+    python helper.py --base origin/master     # branch changes vs base + uncommitted
+    python helper.py --staged
+    python helper.py src/python/adp/modes/cmp_coordinator/app.py
+    python helper.py --repo /path/to/gdpr --json
 """
 
 import argparse
+import fnmatch
+import json
+import os
+import re
+import subprocess
 import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CHANGELOG_NAME = "CHANGELOG.md"
+
+# (repository name glob, path regex, CHANGELOG template) - first match wins.
+# Mirrors the "Find the correct CHANGELOG" table in SKILL.md.
+CHANGELOG_RULES: List[Tuple[str, str, str]] = [
+    ("adp-datalayer-api", r".*", "CHANGELOG.md"),
+    ("gdpr-mobile-api", r".*", "CHANGELOG.md"),
+    ("gdpr-popup", r".*", "CHANGELOG.md"),
+    ("gdpr", r"^src/python/adp/modes/(?P<mode_name>[^/]+)/", "src/python/adp/modes/{mode_name}/CHANGELOG.md"),
+    ("adplatform2", r"^projects/(?P<project_name>[^/]+)/", "projects/{project_name}/CHANGELOG.md"),
+]
+
+# Changes that never require a CHANGELOG entry on their own
+IGNORED_PATTERNS = [
+    "*CHANGELOG.md",
+    ".gitignore",
+    ".github/*",
+    ".claude/*",
+    "*.lock",
+]
+
+VERSION_HEADING = re.compile(r"^\+##\s*\[\d+\.\d+\.\d+\]")
+
+
+class ChangelogIndex:
+    """Precompiled rules plus a directory -> CHANGELOG prefix index for one repository."""
+
+    def __init__(self, repo_root: Path, repo_name: Optional[str] = None,
+                 changelogs: Optional[List[str]] = None):
+        self.repo_root = Path(repo_root)
+        self.repo_name = repo_name or self.repo_root.name
+        self.rules = [
+            (re.compile(path_re), template)
+            for name_glob, path_re, template in CHANGELOG_RULES
+            if fnmatch.fnmatch(self.repo_name, name_glob)
+        ]
+        if changelogs is None:
+            changelogs = list_changelogs(self.repo_root)
+        self.by_dir: Dict[str, str] = {}
+        for path in changelogs:
+            self.add_changelog(path)
+
+    def add_changelog(self, path: str) -> None:
+        """Register a CHANGELOG (repo-relative path) in the prefix index."""
+        self.by_dir[os.path.dirname(path)] = path
+
+    def remove_changelog(self, path: str) -> None:
+        """Drop a CHANGELOG (repo-relative path) from the prefix index."""
+        self.by_dir.pop(os.path.dirname(path), None)
+
+    def nearest(self, path: str) -> Optional[str]:
+        """Nearest existing CHANGELOG at or above the file's directory."""
+        directory = os.path.dirname(path)
+        while True:
+            found = self.by_dir.get(directory)
+            if found:
+                return found
+            if not directory:
+                return None
+            directory = os.path.dirname(directory)
+
+    def resolve(self, path: str) -> Tuple[Optional[str], str]:
+        """Resolve a repo-relative file to (required CHANGELOG, how it was resolved)."""
+        for pattern, template in self.rules:
+            match = pattern.match(path)
+            if match:
+                return template.format(**match.groupdict()), "rule"
+        nearest = self.nearest(path)
+        return nearest, "nearest" if nearest else "none"
+
+
+def is_ignored(path: str) -> bool:
+    """Whether a change is exempt from the CHANGELOG requirement."""
+    return any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS)
+
+
+def git(repo_root: Path, *args: str) -> str:
+    """Run a git command in the repo and return stdout ('' on failure)."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_root), *args],
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return ""
+    return result.stdout if result.returncode == 0 else ""
+
+
+def find_repo_root(start: Path) -> Optional[Path]:
+    """Top-level directory of the git repository containing start."""
+    top = git(start, "rev-parse", "--show-toplevel").strip()
+    return Path(top) if top else None
+
+
+def detect_repo_name(repo_root: Path) -> str:
+    """Repository name from the origin remote, falling back to the directory name."""
+    url = git(repo_root, "remote", "get-url", "origin").strip()
+    if url:
+        name = url.rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+        if name.endswith(".git"):
+            name = name[:-4]
+        if name:
+            return name
+    return repo_root.name
+
+
+def list_changelogs(repo_root: Path) -> List[str]:
+    """All tracked and untracked CHANGELOG.md files (repo-relative)."""
+    out = git(repo_root, "ls-files", "--cached", "--others", "--exclude-standard",
+              f"*{CHANGELOG_NAME}", CHANGELOG_NAME)
+    return sorted(set(line for line in out.splitlines() if line))
+
+
+def changed_files(repo_root: Path, base: Optional[str] = None, staged: bool = False) -> List[str]:
+    """Changed files: staged only, or base...HEAD plus uncommitted and untracked changes."""
+    if staged:
+        return [f for f in git(repo_root, "diff", "--name-only", "--cached").splitlines() if f]
+    files = set()
+    if base:
+        files.update(git(repo_root, "diff", "--name-only", f"{base}...HEAD").splitlines())
+    files.update(git(repo_root, "diff", "--name-only", "HEAD").splitlines())
+    files.update(git(repo_root, "ls-files", "--others", "--exclude-standard").splitlines())
+    return sorted(f for f in files if f)
+
+
+HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+
+def parse_diff(text: str) -> Dict[str, List[Tuple[int, int]]]:
+    """Added/modified line ranges per file from a unified diff (context lines excluded)."""
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    current = None
+    lineno = 0
+    for line in text.splitlines():
+        if line.startswith("+++ "):
+            target = line[4:].split("\t")[0].strip()
+            current = None if target == "/dev/null" else re.sub(r"^[ab]/", "", target)
+            if current:
+                ranges.setdefault(current, [])
+            continue
+        hunk = HUNK.match(line)
+        if hunk:
+            lineno = int(hunk.group(1))
+            continue
+        if current is None or line.startswith(("---", "\\")):
+            continue
+        if line.startswith("+"):
+            file_ranges = ranges[current]
+            if file_ranges and file_ranges[-1][1] == lineno - 1:
+                file_ranges[-1] = (file_ranges[-1][0], lineno)
+            else:
+                file_ranges.append((lineno, lineno))
+            lineno += 1
+        elif line.startswith(" "):
+            lineno += 1
+    return ranges
+
+
+def git_ranges(repo_root: Path, base: Optional[str] = None,
+               pathspecs: Optional[List[str]] = None) -> Dict[str, List[Tuple[int, int]]]:
+    """Changed line ranges vs HEAD, or vs the merge base with `base` (committed + uncommitted)."""
+    ref = "HEAD"
+    if base:
+        ref = git(repo_root, "merge-base", base, "HEAD").strip() or base
+    return parse_diff(git(repo_root, "diff", "-U0", "--no-color", "--no-ext-diff", ref,
+                          "--", *(pathspecs or [])))
+
+
+def merge_base(repo_root: Path, base: str) -> Optional[str]:
+    """Commit where HEAD forked from base (None if base is unknown)."""
+    return git(repo_root, "merge-base", base, "HEAD").strip() or None
+
+
+def changelog_status(repo_root: Path, changelog: str, changed: set,
+                     base: Optional[str] = None, staged: bool = False) -> str:
+    """Classify a CHANGELOG: updated (new version heading), touched, missing, absent.
+
+    `base` is the commit to diff against (the merge-base when a base ref is given).
+    """
+    if not (repo_root / changelog).is_file():
+        return "absent"
+    if changelog not in changed:
+        return "missing"
+    if staged:
+        diff = git(repo_root, "diff", "--cached", "--", changelog)
+    else:
+        diff = git(repo_root, "diff", base or "HEAD", "--", changelog)
+        if not diff and not git(repo_root, "ls-files", "--", changelog).strip():
+            # Untracked new CHANGELOG: the whole file is the addition
+            text = (repo_root / changelog).read_text(errors="replace")
+            diff = "\n".join("+" + line for line in text.splitlines())
+    if any(VERSION_HEADING.match(line) for line in diff.splitlines()):
+        return "updated"
+    return "touched"
+
+
+def build_report(index: ChangelogIndex, files: List[str], base: Optional[str] = None,
+                 staged: bool = False, changed: Optional[set] = None) -> dict:
+    """Map changed files to CHANGELOGs and classify each CHANGELOG.
+
+    `changed` is the full set of changed paths used to tell whether a CHANGELOG was
+    modified (defaults to `files`).
+    """
+    changed = set(files) if changed is None else changed | set(files)
+    # Versions added on the base branch since the fork do not count
+    diff_base = (merge_base(index.repo_root, base) or base) if base else None
+    required: Dict[str, List[str]] = {}
+    unresolved: List[str] = []
+    ignored: List[str] = []
+
+    for path in files:
+        if is_ignored(path):
+            ignored.append(path)
+            continue
+        changelog, _ = index.resolve(path)
+        if changelog is None:
+            unresolved.append(path)
+        else:
+            required.setdefault(changelog, []).append(path)
+
+    changelogs = {
+        changelog: {
+            "status": changelog_status(index.repo_root, changelog, changed, diff_base, staged),
+            "files": sources,
+        }
+        for changelog, sources in sorted(required.items())
+    }
+    return {
+        "repo": str(index.repo_root),
+        "repo_name": index.repo_name,
+        "changed_files": len(files),
+        "changelogs": changelogs,
+        "unresolved": unresolved,
+        "ignored": ignored,
+        "missing": [c for c, info in changelogs.items() if info["status"] != "updated"],
+    }
+
+
+STATUS_LABELS = {
+    "updated": "[OK]",
+    "touched": "[NO VERSION]",
+    "missing": "[MISSING]",
+    "absent": "[NO FILE]",
+}
+
+
+def output_text(report: dict) -> None:
+    """Print the CHANGELOG report as human-readable text."""
+    print(f"Repository: {report['repo_name']} ({report['repo']})")
+    print(f"Changed files: {report['changed_files']}\n")
+
+    if not report["changelogs"] and not report["unresolved"]:
+        print("No changes requiring a CHANGELOG entry.")
+        return
+
+    for changelog, info in report["changelogs"].items():
+        print(f"{STATUS_LABELS[info['status']]} {changelog}")
+        for path in info["files"][:3]:
+            print(f"     └─ {path}")
+        if len(info["files"]) > 3:
+            print(f"     └─ ... {len(info['files']) - 3} more")
+
+    if report["unresolved"]:
+        print("\n[UNRESOLVED] No CHANGELOG found for:")
+        for path in report["unresolved"]:
+            print(f"     └─ {path}")
+
+    if report["missing"]:
+        print(f"\n{len(report['missing'])} CHANGELOG(s) need a new version entry.")
+    else:
+        print("\nAll required CHANGELOGs have a new version entry.")
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Adplatform Guardian helper")
-    parser.add_argument("input", help="Input to process")
+    parser = argparse.ArgumentParser(
+        description="Adplatform Guardian helper - resolve changed files to required CHANGELOGs"
+    )
+    parser.add_argument("files", nargs="*", help="Changed files (default: taken from git)")
+    parser.add_argument(
+        "--repo",
+        type=str,
+        default=os.getcwd(),
+        help="Path inside the repository (default: current directory)",
+    )
+    parser.add_argument("--base", type=str,
+                        help="Also include committed changes since the merge-base with this ref")
+    parser.add_argument("--staged", action="store_true", help="Only consider staged changes")
+    parser.add_argument("--repo-name", type=str, help="Override detected repository name")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
     args = parser.parse_args()
 
-    # TODO: Implement functionality
-    print(f"Processing: {args.input}")
+    repo_root = find_repo_root(Path(args.repo).resolve())
+    if repo_root is None:
+        print(f"Error: not a git repository: {args.repo}", file=sys.stderr)
+        return 1
+
+    if args.base and merge_base(repo_root, args.base) is None:
+        print(f"Error: unknown base ref (no merge-base with HEAD): {args.base}", file=sys.stderr)
+        return 1
+
+    index = ChangelogIndex(repo_root, args.repo_name or detect_repo_name(repo_root))
+    git_changed = changed_files(repo_root, args.base, args.staged)
+    if args.files:
+        files = []
+        for f in args.files:
+            path = Path(f)
+            if path.is_absolute() or path.exists():
+                path = path.resolve()
+                try:
+                    f = str(path.relative_to(repo_root))
+                except ValueError:
+                    print(f"Warning: {f} is outside {repo_root}", file=sys.stderr)
+                    continue
+            files.append(f)
+    else:
+        files = git_changed
+
+    report = build_report(index, files, args.base, args.staged, set(git_changed))
+
+    if args.json_output:
+        print(json.dumps(report, indent=2))
+    else:
+        output_text(report)
+
+    return 1 if report["missing"] else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
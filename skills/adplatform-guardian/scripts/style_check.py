@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Python style checker for the guardian's code standards (detailed-rules.md).
+
+Parses changed Python files with `ast` and checks three rule families:
+  T  type hints      - parameters and return values are annotated
+  D  docstrings      - public functions have Args/Returns/Raises sections that
+                       match the signature and body
+  I  import order    - standard library, then third-party, then local imports
+
+Module-level functions and methods are checked; functions nested in another
+function (closures) are implementation details and are skipped, like private
+ones. Findings are cached per file content hash and only reported for changed
+lines when a diff is available (git changes or --diff); Returns/Raises findings
+also count as changed when any line of the function body changed. Files that need parsing are
+spread over a process pool.
+
+Usage:
+    python style_check.py                          # uncommitted changes vs HEAD
+    python style_check.py --base origin/master     # whole branch
+    python style_check.py src/python/adp/modes/cmp_coordinator/app.py --full
+    git diff origin/master | python style_check.py --diff -
+    python style_check.py --json
+"""
+
+import argparse
+import ast
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from helper import changed_files, find_repo_root, git, git_ranges, parse_diff  # noqa: E402
+from test_impact import DEFAULT_PYTHON_ROOTS  # noqa: E402
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "claude-toolkit"
+CACHE_VERSION = 2
+
+# Import roots whose top-level packages count as local (adplatform2 keeps one per project)
+LOCAL_ROOTS = DEFAULT_PYTHON_ROOTS + ["projects/*", "projects/*/src"]
+# Internal libraries, local even when installed as packages (adp_observability, adp_config, ...)
+INTERNAL_PACKAGE = re.compile(r"^adp(_|$)")
+
+# Below this many files to parse, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+RULES = {
+    "T001": ("error", "parameter '{name}' has no type hint"),
+    "T002": ("error", "'{name}' has no return type hint"),
+    "D001": ("error", "public function '{name}' has no docstring"),
+    "D002": ("warning", "docstring has no Args: section (parameters: {names})"),
+    "D003": ("warning", "parameter '{name}' is not documented in Args:"),
+    "D004": ("warning", "Args: documents '{name}', which is not a parameter"),
+    "D005": ("warning", "docstring has no Returns: section"),
+    "D006": ("warning", "docstring has no Raises: section (raises {names})"),
+    "D007": ("warning", "'{name}' is raised but not listed in Raises:"),
+    "I001": ("error", "{group} import '{name}' after {previous} import '{previous_name}'"),
+}
+
+GROUPS = ["future", "standard library", "third-party", "local"]
+
+SECTION = re.compile(r"^\s*(Args|Arguments|Returns|Yields|Raises):\s*$")
+ARG_ENTRY = re.compile(r"^\s*\*{0,2}(?:\w+\.)*(\w+)\s*(?:\([^)]*\))?\s*:")
+STUB_EXCEPTIONS = {"NotImplementedError"}
+
+_local_names: FrozenSet[str] = frozenset()
+
+
+# === Checks (run in worker processes) ===
+
+def _init_worker(local_names: FrozenSet[str]) -> None:
+    global _local_names
+    _local_names = local_names
+
+
+def finding(code: str, line: int, span: Tuple[int, int], **fields) -> dict:
+    level, template = RULES[code]
+    return {"code": code, "level": level, "line": line, "span": list(span),
+            "message": template.format(**fields)}
+
+
+def stdlib_names() -> Set[str]:
+    names = getattr(sys, "stdlib_module_names", None)
+    if names:
+        return set(names)
+    return set(sys.builtin_module_names) | {  # Python < 3.10: common modules only
+        "abc", "argparse", "ast", "asyncio", "base64", "collections", "concurrent", "contextlib",
+        "copy", "csv", "dataclasses", "datetime", "decimal", "enum", "functools", "glob", "gzip",
+        "hashlib", "hmac", "http", "importlib", "inspect", "io", "itertools", "json", "logging",
+        "math", "multiprocessing", "operator", "os", "pathlib", "pickle", "random", "re",
+        "shutil", "socket", "string", "struct", "subprocess", "tempfile", "threading", "time",
+        "traceback", "typing", "unittest", "urllib", "uuid", "warnings", "weakref", "zlib",
+    }
+
+
+STDLIB = stdlib_names()
+
+
+def import_group(node: ast.stmt, local_names: FrozenSet[str]) -> Tuple[int, str]:
+    """Group index (see GROUPS) and display name of an import statement."""
+    if isinstance(node, ast.ImportFrom):
+        if node.level:
+            return 3, "." * node.level + (node.module or "")
+        name = node.module or ""
+    else:
+        name = node.names[0].name
+    top = name.split(".")[0]
+    if top == "__future__":
+        return 0, name
+    if top in local_names or INTERNAL_PACKAGE.match(top):
+        return 3, name
+    if top in STDLIB:
+        return 1, name
+    return 2, name
+
+
+def check_imports(tree: ast.Module, local_names: FrozenSet[str]) -> List[dict]:
+    """Module-level imports must go standard library -> third-party -> local."""
+    findings = []
+    highest: Optional[Tuple[int, str]] = None
+    for node in tree.body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            continue
+        group, name = import_group(node, local_names)
+        if highest and group < highest[0]:
+            findings.append(finding(
+                "I001", node.lineno, (node.lineno, node.end_lineno or node.lineno),
+                group=GROUPS[group], name=name, previous=GROUPS[highest[0]], previous_name=highest[1],
+            ))
+        elif not highest or group > highest[0]:
+            highest = (group, name)
+    return findings
+
+
+def own_nodes(func: ast.AST):
+    """Nodes in a function body, not descending into nested functions, classes or lambdas."""
+    stack = list(func.body)
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+                stack.append(child)
+
+
+def raised_names(func: ast.AST) -> List[str]:
+    names = []
+    for node in own_nodes(func):
+        if isinstance(node, ast.Raise) and node.exc is not None:
+            exc = node.exc.func if isinstance(node.exc, ast.Call) else node.exc
+            name = exc.attr if isinstance(exc, ast.Attribute) else getattr(exc, "id", None)
+            if name and name not in STUB_EXCEPTIONS and name not in names:
+                names.append(name)
+    return names
+
+
+def docstring_sections(doc: str) -> Dict[str, List[str]]:
+    """Google-style sections -> entry names (Args/Raises) or content lines."""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    indent = 0
+    for line in doc.splitlines():
+        header = SECTION.match(line)
+        if header:
+            current = "Args" if header.group(1) == "Arguments" else header.group(1)
+            sections[current] = []
+            indent = len(line) - len(line.lstrip())
+            continue
+        if current is None or not line.strip():
+            continue
+        if len(line) - len(line.lstrip()) <= indent:
+            current = None
+            continue
+        entry = ARG_ENTRY.match(line)
+        if current in ("Args", "Raises"):
+            if entry and len(line) - len(line.lstrip()) <= indent + 4:
+                sections[current].append(entry.group(1))
+        else:
+            sections[current].append(line.strip())
+    return sections
+
+
+def decorator_names(func: ast.AST) -> Set[str]:
+    names = set()
+    for decorator in func.decorator_list:
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        names.add(target.attr if isinstance(target, ast.Attribute) else getattr(target, "id", ""))
+    return names
+
+
+def check_function(func: ast.AST, in_class: bool, check_docs: bool) -> List[dict]:
+    """Type hints and docstring rules for one function or method."""
+    findings = []
+    decorators = decorator_names(func)
+    if "overload" in decorators:
+        return findings
+    body_start = func.body[0].lineno
+    signature = (func.lineno, max(func.lineno, body_start - 1))
+
+    args = func.args
+    params = args.posonlyargs + args.args
+    if in_class and params and "staticmethod" not in decorators:
+        params = params[1:]  # self / cls
+    params = params + args.kwonlyargs + [a for a in (args.vararg, args.kwarg) if a]
+
+    for arg in params:
+        if arg.annotation is None:
+            findings.append(finding("T001", arg.lineno, signature, name=arg.arg))
+    if func.returns is None and func.name != "__init__":
+        findings.append(finding("T002", func.lineno, signature, name=func.name))
+
+    if not check_docs or func.name.startswith("_") or "property" in decorators and not params:
+        return findings
+
+    doc_node = func.body[0] if isinstance(func.body[0], ast.Expr) and \
+        isinstance(getattr(func.body[0], "value", None), ast.Constant) and \
+        isinstance(func.body[0].value.value, str) else None
+    if doc_node is None:
+        findings.append(finding("D001", func.lineno, signature, name=func.name))
+        return findings
+
+    span = (func.lineno, doc_node.end_lineno or doc_node.lineno)
+    # Returns/Raises depend on the body, so a body edit can introduce them
+    body_span = (func.lineno, func.end_lineno or span[1])
+    sections = docstring_sections(ast.get_docstring(func) or "")
+    names = [a.arg for a in params]
+    if names:
+        if "Args" not in sections:
+            findings.append(finding("D002", doc_node.lineno, span, names=", ".join(names)))
+        else:
+            documented = sections["Args"]
+            findings.extend(finding("D003", doc_node.lineno, span, name=n) for n in names if n not in documented)
+            findings.extend(finding("D004", doc_node.lineno, span, name=n) for n in documented if n not in names)
+
+    nodes = list(own_nodes(func))
+    returns_value = any(isinstance(n, ast.Return) and n.value is not None and
+                        not (isinstance(n.value, ast.Constant) and n.value.value is None) for n in nodes)
+    yields = any(isinstance(n, (ast.Yield, ast.YieldFrom)) for n in nodes)
+    annotated_none = isinstance(func.returns, ast.Constant) and func.returns.value is None
+    if (returns_value or yields or (func.returns is not None and not annotated_none)) \
+            and func.name != "__init__" and "property" not in decorators \
+            and "Returns" not in sections and "Yields" not in sections:
+        findings.append(finding("D005", doc_node.lineno, body_span))
+
+    raised = raised_names(func)
+    if raised:
+        if "Raises" not in sections:
+            findings.append(finding("D006", doc_node.lineno, body_span, names=", ".join(raised)))
+        else:
+            findings.extend(finding("D007", doc_node.lineno, body_span, name=n)
+                            for n in raised if n not in sections["Raises"])
+    return findings
+
+
+def check_source(path: str, source: bytes, local_names: Optional[FrozenSet[str]] = None) -> List[dict]:
+    """All findings for one file (whole file; changed-line filtering happens later)."""
+    if local_names is None:
+        local_names = _local_names
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError) as e:
+        line = getattr(e, "lineno", None) or 1
+        return [{"code": "E999", "level": "error", "line": line, "span": [line, line],
+                 "message": f"cannot parse: {e.msg if isinstance(e, SyntaxError) else e}"}]
+
+    name = os.path.basename(path)
+    check_docs = not (name.startswith("test_") or name.endswith("_test.py") or name == "conftest.py")
+    findings = check_imports(tree, local_names)
+
+    stack = [(node, False) for node in tree.body]
+    while stack:
+        node, in_class = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            docs = check_docs and not node.name.startswith("test_")
+            findings.extend(check_function(node, in_class, docs))
+            # Nested functions are closures, not API: their bodies are not checked
+        elif isinstance(node, ast.ClassDef):
+            stack.extend((child, True) for child in node.body)
+        else:
+            stack.extend((child, False) for child in ast.iter_child_nodes(node)
+                         if isinstance(child, ast.stmt))
+    return sorted(findings, key=lambda f: (f["line"], f["code"]))
+
+
+def _check_job(job: Tuple[str, bytes]) -> List[dict]:
+    return check_source(job[0], job[1])
+
+
+# === Changed lines ===
+
+def in_ranges(span: List[int], ranges: Optional[List[Tuple[int, int]]]) -> bool:
+    if ranges is None:
+        return True
+    return any(span[0] <= end and start <= span[1] for start, end in ranges)
+
+
+# === Driver ===
+
+def local_names_for(repo_root: Path, roots: List[str]) -> FrozenSet[str]:
+    """Top-level importable names found under the repository's import roots."""
+    names = set()
+    patterns = [[] if r == "." else r.strip("/").split("/") for r in roots]
+    for path in git(repo_root, "ls-files", "*.py").splitlines():
+        parts = path.split("/")
+        for pattern in patterns:
+            depth = len(pattern)
+            if len(parts) > depth and all(fnmatch.fnmatch(p, q) for p, q in zip(parts, pattern)):
+                top = parts[depth]
+                names.add(top[:-3] if top.endswith(".py") else top)
+    names.discard("__init__")
+    return frozenset(n for n in names if n.isidentifier())
+
+
+class StyleChecker:
+    """Check files with a per-file result cache (stat, then content hash)."""
+
+    def __init__(self, repo_root: Path, local_names: FrozenSet[str], cache_dir: Path, workers: int):
+        self.repo_root = repo_root
+        self.local_names = local_names
+        self.workers = workers
+        key = hashlib.sha1(str(repo_root).encode()).hexdigest()[:12]
+        self.cache_file = cache_dir / f"style_check-{key}.json"
+        # Import grouping depends on the repo's local packages
+        self.config = hashlib.sha1(
+            f"{CACHE_VERSION}:{','.join(sorted(local_names))}".encode()).hexdigest()
+        self.files: Dict[str, dict] = {}
+        self.stats = {"parsed": 0, "cached": 0}
+
+    def load_cache(self) -> None:
+        try:
+            cached = json.loads(self.cache_file.read_text())
+            if cached.get("config") == self.config:
+                self.files = cached["files"]
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+
+    def save_cache(self) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"config": self.config, "files": self.files}))
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"Warning: could not write cache {self.cache_file}: {e}", file=sys.stderr)
+
+    def check(self, paths: List[str]) -> Dict[str, List[dict]]:
+        """Findings per path; only files whose content changed are parsed."""
+        results: Dict[str, List[dict]] = {}
+        todo: List[Tuple[str, bytes, dict]] = []
+        for path in paths:
+            full = self.repo_root / path
+            try:
+                st = full.stat()
+            except OSError:
+                continue
+            entry = self.files.get(path)
+            stat_key = [st.st_mtime_ns, st.st_size]
+            if entry and entry["stat"] == stat_key:
+                results[path] = entry["findings"]
+                self.stats["cached"] += 1
+                continue
+            source = full.read_bytes()
+            digest = hashlib.sha256(source).hexdigest()
+            if entry and entry["sha256"] == digest:
+                entry["stat"] = stat_key
+                results[path] = entry["findings"]
+                self.stats["cached"] += 1
+                continue
+            todo.append((path, source, {"stat": stat_key, "sha256": digest}))
+
+        jobs = [(path, source) for path, source, _ in todo]
+        if len(jobs) >= PARALLEL_THRESHOLD and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.local_names,)) as pool:
+                outputs = list(pool.map(_check_job, jobs, chunksize=max(1, len(jobs) // (self.workers * 4))))
+        else:
+            outputs = [check_source(path, source, self.local_names) for path, source in jobs]
+
+        for (path, _, entry), findings in zip(todo, outputs):
+            entry["findings"] = findings
+            self.files[path] = entry
+            results[path] = findings
+            self.stats["parsed"] += 1
+        return results
+
+
+def build_report(results: Dict[str, List[dict]], ranges: Optional[Dict[str, List[Tuple[int, int]]]],
+                 stats: dict) -> dict:
+    """Flatten findings, keeping only those that touch changed lines."""
+    findings = []
+    for path in sorted(results):
+        file_ranges = None if ranges is None else ranges.get(path, [])
+        for item in results[path]:
+            if in_ranges(item["span"], file_ranges):
+                findings.append({"path": path, **{k: v for k, v in item.items() if k != "span"}})
+    summary: Dict[str, int] = {}
+    for item in findings:
+        summary[item["code"]] = summary.get(item["code"], 0) + 1
+    return {
+        "files_checked": len(results),
+        "parsed": stats["parsed"],
+        "cached": stats["cached"],
+        "changed_lines_only": ranges is not None,
+        "errors": sum(1 for f in findings if f["level"] == "error"),
+        "warnings": sum(1 for f in findings if f["level"] == "warning"),
+        "summary": dict(sorted(summary.items())),
+        "findings": findings,
+    }
+
+
+def output_text(report: dict) -> None:
+    """Print findings as path:line: CODE message."""
+    for item in report["findings"]:
+        print(f"{item['path']}:{item['line']}: {item['code']} {item['message']}")
+    scope = "changed lines" if report["changed_lines_only"] else "whole files"
+    if report["findings"]:
+        print()
+    print(f"{report['files_checked']} file(s) checked ({scope}; {report['parsed']} parsed, "
+          f"{report['cached']} cached): {report['errors']} error(s), {report['warnings']} warning(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Adplatform Guardian - check type hints, docstrings and import order"
+    )
+    parser.add_argument("files", nargs="*", help="Python files (default: changed files from git)")
+    parser.add_argument(
+        "--repo",
+        type=str,
+        default=os.getcwd(),
+        help="Path inside the repository (default: current directory)",
+    )
+    parser.add_argument("--base", type=str, help="Also include committed changes since this ref")
+    parser.add_argument("--diff", metavar="PATCH",
+                        help="Unified diff to take files and changed lines from ('-' for stdin)")
+    parser.add_argument("--full", action="store_true", help="Report findings on all lines, not just changed ones")
+    parser.add_argument(
+        "--root",
+        action="append",
+        help=f"Import root whose packages count as local (repeatable, default: {', '.join(LOCAL_ROOTS)})",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parser processes")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+    parser.add_argument("--cache-dir", type=str, default=str(DEFAULT_CACHE_DIR),
+                        help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the cache")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    repo_root = find_repo_root(Path(args.repo).resolve())
+    if repo_root is None:
+        print(f"Error: not a git repository: {args.repo}", file=sys.stderr)
+        return 1
+
+    ranges: Optional[Dict[str, List[Tuple[int, int]]]] = None
+    if args.diff:
+        text = sys.stdin.read() if args.diff == "-" else Path(args.diff).read_text()
+        ranges = parse_diff(text)
+        files = list(ranges)
+    elif args.files:
+        files = []
+        for f in args.files:
+            path = Path(f)
+            if path.is_absolute() or path.exists():
+                try:
+                    f = str(path.resolve().relative_to(repo_root))
+                except ValueError:
+                    print(f"Warning: {f} is outside {repo_root}", file=sys.stderr)
+                    continue
+            files.append(f)
+    else:
+        files = changed_files(repo_root, args.base)
+        ranges = git_ranges(repo_root, args.base, ["*.py"])
+        # Untracked files have no diff: check them whole
+        for f in files:
+            ranges.setdefault(f, None)
+    if args.full:
+        ranges = None
+
+    files = [f for f in files if f.endswith(".py") and (repo_root / f).is_file()]
+    checker = StyleChecker(repo_root, local_names_for(repo_root, args.root or LOCAL_ROOTS),
+                           Path(args.cache_dir).expanduser(), args.workers)
+    if not args.no_cache:
+        checker.load_cache()
+    results = checker.check(files)
+    if not args.no_cache:
+        checker.save_cache()
+
+    report = build_report(results, ranges, checker.stats)
+    if args.json_output:
+        print(json.dumps({"repo": str(repo_root), **report}, indent=2))
+    else:
+        output_text(report)
+
+    return 1 if report["errors"] or (args.strict and report["warnings"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
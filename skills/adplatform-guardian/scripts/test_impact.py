@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Test-impact analysis for the guardian's test-coverage requirement.
+
+Builds an import/dependency graph from sources to tests (Python via `ast`, Go via
+import blocks and go.mod), caches the parsed imports per file and re-parses only
+files whose stat changed. Given the current diff it returns the minimal set of
+tests that exercise the changed code, plus changed modules with no test at all.
+
+Usage:
+    python test_impact.py                        # uncommitted changes vs HEAD
+    python test_impact.py --base origin/master
+    python test_impact.py src/python/adp/modes/cmp_coordinator/app.py
+    python test_impact.py --root src/python --root tests/python --json
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from helper import changed_files, find_repo_root, git  # noqa: E402
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "claude-toolkit"
+CACHE_VERSION = 1
+
+# Import roots used by AdPlatform (PYTHONPATH=lib:src/python:tests/python) and adplatform2
+DEFAULT_PYTHON_ROOTS = ["src/python", "lib", "tests/python", "src", "."]
+
+GO_IMPORT_BLOCK = re.compile(r"^import\s*\((.*?)\)", re.S | re.M)
+GO_IMPORT_LINE = re.compile(r'^import\s+(?:[\w.]+\s+)?"([^"]+)"', re.M)
+GO_QUOTED = re.compile(r'"([^"]+)"')
+GO_MODULE = re.compile(r"^module\s+(\S+)", re.M)
+
+
+def is_python_test(path: str) -> bool:
+    """Test modules follow pytest discovery naming."""
+    name = os.path.basename(path)
+    return name.startswith("test_") or name.endswith("_test.py")
+
+
+def is_test(path: str) -> bool:
+    if path.endswith(".go"):
+        return path.endswith("_test.go")
+    return is_python_test(path)
+
+
+# === Parsing ===
+
+def python_imports(source: str, module: str, is_package: bool) -> List[str]:
+    """Absolute dotted names imported by a module (relative imports resolved)."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    package = module if is_package else module.rpartition(".")[0]
+    names: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".") if package else []
+                if node.level - 1 > len(parts):
+                    continue
+                base_parts = parts[:len(parts) - (node.level - 1)]
+                base = ".".join(base_parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            if not base:
+                continue
+            names.append(base)
+            # `from pkg import submodule` imports pkg.submodule
+            names.extend(f"{base}.{alias.name}" for alias in node.names if alias.name != "*")
+    return names
+
+
+def go_imports(source: str) -> List[str]:
+    """Import paths from a Go source file."""
+    imports = GO_IMPORT_LINE.findall(source)
+    for block in GO_IMPORT_BLOCK.findall(source):
+        imports.extend(GO_QUOTED.findall(block))
+    return imports
+
+
+# === Graph ===
+
+class ImpactGraph:
+    """Per-file import cache plus resolution into a reverse dependency graph."""
+
+    def __init__(self, repo_root: Path, python_roots: List[str], cache_dir: Path):
+        self.repo_root = repo_root
+        self.python_roots = [r.strip("/") if r != "." else "" for r in python_roots]
+        key = hashlib.sha1(str(repo_root).encode()).hexdigest()[:12]
+        self.cache_file = cache_dir / f"test_impact-{key}.json"
+        self.files: Dict[str, dict] = {}
+        self.stats = {"parsed": 0, "cached": 0}
+        self.module_to_file: Dict[str, str] = {}
+        self.reverse: Dict[str, Set[str]] = {}
+
+    # --- cache ---
+
+    def load_cache(self) -> None:
+        try:
+            cached = json.loads(self.cache_file.read_text())
+            if cached.get("version") == CACHE_VERSION:
+                self.files = cached["files"]
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+
+    def save_cache(self) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "files": self.files}))
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"Warning: could not write cache {self.cache_file}: {e}", file=sys.stderr)
+
+    # --- module naming ---
+
+    def module_names(self, path: str) -> List[str]:
+        """Dotted module names a Python file is importable as, one per matching root."""
+        stem = path[:-3]
+        if stem.endswith("/__init__"):
+            stem = stem[: -len("/__init__")]
+        names = []
+        for root in self.python_roots:
+            if root and not stem.startswith(root + "/"):
+                continue
+            rel = stem[len(root) + 1:] if root else stem
+            if rel and "-" not in rel:
+                names.append(rel.replace("/", "."))
+        return names
+
+    # --- scanning ---
+
+    def scan(self, paths: Optional[Iterable[str]] = None) -> None:
+        """Refresh cached imports for all tracked .py/.go files (or only `paths`)."""
+        if paths is None:
+            listed = git(self.repo_root, "ls-files", "--cached", "--others", "--exclude-standard",
+                         "*.py", "*.go", "go.mod")
+            paths = [p for p in listed.splitlines() if p]
+            # Forget deleted files
+            present = set(paths)
+            self.files = {p: v for p, v in self.files.items() if p in present}
+        for path in paths:
+            self.update_file(path)
+        self.resolve()
+
+    def update_file(self, path: str) -> None:
+        """Re-parse a file if its size/mtime changed since the cached entry."""
+        full = self.repo_root / path
+        try:
+            st = full.stat()
+        except OSError:
+            self.files.pop(path, None)
+            return
+        cached = self.files.get(path)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            self.stats["cached"] += 1
+            return
+
+        source = full.read_text(errors="replace")
+        if path.endswith(".go"):
+            imports = go_imports(source)
+        elif path.endswith("go.mod"):
+            match = GO_MODULE.search(source)
+            imports = [match.group(1)] if match else []
+        else:
+            names = self.module_names(path)
+            module = names[0] if names else Path(path).stem
+            imports = python_imports(source, module, path.endswith("__init__.py"))
+        self.files[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "imports": sorted(set(imports))}
+        self.stats["parsed"] += 1
+
+    def resolve(self) -> None:
+        """Resolve raw imports to repo files and build the reverse graph (node -> importers).
+
+        Python nodes are files; Go nodes are package directories.
+        """
+        self.module_to_file = {}
+        for path in self.files:
+            if path.endswith(".py"):
+                for name in self.module_names(path):
+                    self.module_to_file.setdefault(name, path)
+        go_mods = {os.path.dirname(p): v["imports"][0] for p, v in self.files.items()
+                   if p.endswith("go.mod") and v["imports"]}
+
+        self.reverse = {}
+        for path, entry in self.files.items():
+            if path.endswith(".py"):
+                node = path
+                targets = self._resolve_python(entry["imports"])
+            elif path.endswith(".go"):
+                node = self.go_node(path)
+                targets = self._resolve_go(entry["imports"], go_mods)
+            else:
+                continue
+            for target in targets:
+                if target != node:
+                    self.reverse.setdefault(target, set()).add(node)
+
+    def _resolve_python(self, imports: List[str]) -> Set[str]:
+        targets = set()
+        for name in imports:
+            # Every known prefix: importing a.b.c also runs a/__init__.py and a/b/__init__.py
+            while name:
+                target = self.module_to_file.get(name)
+                if target:
+                    targets.add(target)
+                name = name.rpartition(".")[0]
+        return targets
+
+    @staticmethod
+    def _resolve_go(imports: List[str], go_mods: Dict[str, str]) -> Set[str]:
+        targets = set()
+        for imp in imports:
+            for mod_dir, module in go_mods.items():
+                if imp == module or imp.startswith(module + "/"):
+                    rel = imp[len(module):].strip("/")
+                    targets.add("go:" + os.path.join(mod_dir, rel).strip("/"))
+                    break
+        return targets
+
+    @staticmethod
+    def go_node(path: str) -> str:
+        return "go:" + os.path.dirname(path)
+
+    # --- queries ---
+
+    def tests_in(self, node: str) -> Set[str]:
+        """Test files belonging to a graph node."""
+        if node.startswith("go:"):
+            directory = node[3:]
+            return {p for p in self.files if p.endswith("_test.go") and os.path.dirname(p) == directory}
+        return {node} if is_python_test(node) else set()
+
+    def impacted_tests(self, path: str) -> Set[str]:
+        """Tests that transitively depend on a changed file."""
+        if os.path.basename(path) == "conftest.py":
+            prefix = os.path.dirname(path)
+            return {p for p in self.files if is_python_test(p) and p.startswith(prefix)}
+        start = self.go_node(path) if path.endswith(".go") else path
+        seen = {start}
+        queue = deque([start])
+        tests: Set[str] = set(self.tests_in(start))
+        while queue:
+            node = queue.popleft()
+            for importer in self.reverse.get(node, ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    queue.append(importer)
+                    tests.update(self.tests_in(importer))
+        if path.endswith(".go"):
+            # A changed package is always exercised by its own tests
+            tests.update(self.tests_in(start))
+        return tests
+
+
+def is_empty_package_init(path: Path) -> bool:
+    """An __init__.py with nothing but whitespace (no code to test)."""
+    if path.name != "__init__.py":
+        return False
+    try:
+        return not path.read_text(errors="replace").strip()
+    except OSError:
+        return False
+
+
+def build_commands(tests: List[str]) -> List[str]:
+    """Suggested commands to run the selected tests."""
+    commands = []
+    py_tests = [t for t in tests if t.endswith(".py")]
+    go_pkgs = sorted({os.path.dirname(t) for t in tests if t.endswith(".go")})
+    if py_tests:
+        commands.append("python -m pytest " + " ".join(py_tests))
+    if go_pkgs:
+        commands.append("go test -race " + " ".join(f"./{p}" if p else "." for p in go_pkgs))
+    return commands
+
+
+def analyze(graph: ImpactGraph, files: List[str]) -> dict:
+    """Select tests for changed files and list changed modules without any test."""
+    selected: Set[str] = set()
+    per_file: Dict[str, List[str]] = {}
+    untested: List[str] = []
+
+    for path in files:
+        if not (path.endswith(".py") or path.endswith(".go")):
+            continue
+        if not (graph.repo_root / path).exists():
+            continue  # deleted
+        if is_test(path):
+            selected.add(path)
+            continue
+        tests = graph.impacted_tests(path)
+        per_file[path] = sorted(tests)
+        selected.update(tests)
+        if not tests and not is_empty_package_init(graph.repo_root / path):
+            untested.append(path)
+
+    tests = sorted(selected)
+    return {
+        "repo": str(graph.repo_root),
+        "files": graph.stats,
+        "tests": tests,
+        "by_file": per_file,
+        "untested": untested,
+        "commands": build_commands(tests),
+    }
+
+
+def output_text(report: dict) -> None:
+    """Print selected tests and untested modules."""
+    stats = report["files"]
+    print(f"Graph: {stats['parsed']} parsed, {stats['cached']} cached\n")
+    if not report["by_file"] and not report["tests"]:
+        print("No changed Python or Go sources.")
+        return
+
+    print(f"Tests to run ({len(report['tests'])}):")
+    for test in report["tests"]:
+        print(f"  {test}")
+
+    if report["untested"]:
+        print(f"\n[NO TEST] Changed modules without any test ({len(report['untested'])}):")
+        for path in report["untested"]:
+            print(f"  {path}")
+
+    if report["commands"]:
+        print("\nRun:")
+        for command in report["commands"]:
+            print(f"  {command}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Select the minimal set of tests impacted by the current changes"
+    )
+    parser.add_argument("files", nargs="*", help="Changed files (default: taken from git)")
+    parser.add_argument(
+        "--repo",
+        type=str,
+        default=os.getcwd(),
+        help="Path inside the repository (default: current directory)",
+    )
+    parser.add_argument("--base", type=str, help="Also include committed changes since this ref")
+    parser.add_argument("--staged", action="store_true", help="Only consider staged changes")
+    parser.add_argument(
+        "--root",
+        action="append",
+        dest="roots",
+        help=f"Python import root (repeatable, default: {', '.join(DEFAULT_PYTHON_ROOTS)})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    repo_root = find_repo_root(Path(args.repo).resolve())
+    if repo_root is None:
+        print(f"Error: not a git repository: {args.repo}", file=sys.stderr)
+        return 1
+
+    graph = ImpactGraph(repo_root, args.roots or DEFAULT_PYTHON_ROOTS, Path(args.cache_dir).expanduser())
+    graph.load_cache()
+    graph.scan()
+    graph.save_cache()
+
+    if args.files:
+        files = []
+        for f in args.files:
+            path = Path(f)
+            if path.is_absolute() or path.exists():
+                try:
+                    f = str(path.resolve().relative_to(repo_root))
+                except ValueError:
+                    print(f"Warning: {f} is outside {repo_root}", file=sys.stderr)
+                    continue
+            files.append(f)
+    else:
+        files = changed_files(repo_root, args.base, args.staged)
+
+    report = analyze(graph, files)
+
+    if args.json_output:
+        print(json.dumps(report, indent=2))
+    else:
+        output_text(report)
+
+    return 1 if report["untested"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,24 @@
 #!/bin/bash
 # Clone a GDPR CMP repository using GitHub CLI
 # Usage: ./clone_repo.sh <repo_name> [target_directory]
+#
+# gh calls are timed and bounded by a timeout (coreutils `timeout`/`gtimeout`, or a
+# background watcher that kills the process group). With CLAUDE_TOOLKIT_TRACE=<file> a
+# span per call is appended to <file> in the same JSON-lines format as
+# proc_trace.py (summarize with: python proc_trace.py summary <file>).
+# A successful `gh auth status` is cached for CLAUDE_TOOLKIT_GH_AUTH_TTL seconds,
+# shared with the Python scripts.
 
 REPO_NAME=$1
 TARGET_DIR=${2:-.}
 ORG="Ringier-Axel-Springer-PL"
 
+CLONE_TIMEOUT=${CLONE_TIMEOUT:-900}
+AUTH_TIMEOUT=15
+AUTH_TTL=${CLAUDE_TOOLKIT_GH_AUTH_TTL:-300}
+AUTH_CACHE="$HOME/.cache/claude-toolkit/gh-auth.json"
+TIMEOUT_EXIT_CODE=124
+
 # Available repositories
 AVAILABLE_REPOS=(
     "gdpr-popup"
@@ -22,6 +35,102 @@ AVAILABLE_REPOS=(
     "gdpr-iab-files"
 )
 
+now_ms() {
+    if [ -n "$EPOCHREALTIME" ]; then
+        local t=${EPOCHREALTIME/[.,]/}
+        echo $((t / 1000))
+    else
+        echo $(($(date +%s) * 1000))
+    fi
+}
+
+# with_timeout <seconds> <command...>
+# Fallback for `timeout` (e.g. stock macOS): runs the command as its own process
+# group and kills the group once the limit passes. Exits 124 on timeout.
+with_timeout() {
+    local limit=$1
+    shift
+    local fired pid watcher rc
+    fired=$(mktemp)
+    set -m
+    "$@" &
+    pid=$!
+    ( sleep "$limit"; echo 1 > "$fired"; kill -TERM -- "-$pid"; sleep 5; kill -KILL -- "-$pid" ) \
+        > /dev/null 2>&1 &
+    watcher=$!
+    set +m
+    wait "$pid"
+    rc=$?
+    kill -- "-$watcher" 2> /dev/null
+    [ -s "$fired" ] && rc=$TIMEOUT_EXIT_CODE
+    rm -f "$fired"
+    return "$rc"
+}
+
+# JSON string contents: escape backslashes, quotes and whitespace, drop other control characters
+json_escape() {
+    local s=${1//\\/\\\\}
+    s=${s//\"/\\\"}
+    s=${s//$'\n'/\\n}
+    s=${s//$'\r'/\\r}
+    s=${s//$'\t'/\\t}
+    printf '%s' "$s" | LC_ALL=C tr -d '\000-\037'
+}
+
+# traced <timeout_seconds> <command...>
+# Runs the command (stdout and stderr pass through), kills it after the timeout
+# (`timeout`/`gtimeout` when available, else with_timeout) and records a span if
+# CLAUDE_TOOLKIT_TRACE is set.
+traced() {
+    local limit=$1
+    shift
+    local runner=(with_timeout "$limit")
+    if command -v timeout &> /dev/null; then
+        runner=(timeout "$limit")
+    elif command -v gtimeout &> /dev/null; then
+        runner=(gtimeout "$limit")
+    fi
+
+    local out err status start rc duration
+    out=$(mktemp)
+    err=$(mktemp)
+    status=$(mktemp)
+    start=$(now_ms)
+    # stdout -> tee $out -> stdout, stderr -> tee $err -> stderr; the exit code goes via $status
+    { { "${runner[@]}" "$@"; echo $? > "$status"; } 2>&1 1>&3 3>&- | tee "$err" >&2; } 3>&1 | tee "$out"
+    rc=$(cat "$status")
+    duration=$(($(now_ms) - start))
+
+    if [ -n "$CLAUDE_TOOLKIT_TRACE" ]; then
+        local label="$1 $2"
+        case "$2" in
+            repo|auth) label="$1 $2 $3" ;;
+        esac
+        local timed_out=false
+        [ "$rc" -eq "$TIMEOUT_EXIT_CODE" ] && timed_out=true
+        printf '{"ts": %s, "pid": %s, "label": "%s", "cmd": "%s", "timeout_s": %s, "exit_code": %s, "timed_out": %s, "duration_ms": %s, "stdout_bytes": %s, "stderr_bytes": %s}\n' \
+            "$((start / 1000))" "$$" "$(json_escape "$label")" "$(json_escape "$*")" "$limit" "$rc" \
+            "$timed_out" "$duration" "$(wc -c < "$out" | tr -d ' ')" "$(wc -c < "$err" | tr -d ' ')" \
+            >> "$CLAUDE_TOOLKIT_TRACE"
+    fi
+    rm -f "$out" "$err" "$status"
+    return "$rc"
+}
+
+# gh auth status, skipped while a successful result is cached
+gh_auth_ok() {
+    if [ -f "$AUTH_CACHE" ] && grep -q '"ok": true' "$AUTH_CACHE"; then
+        local checked
+        checked=$(sed -n 's/.*"checked_at": *\([0-9]*\).*/\1/p' "$AUTH_CACHE")
+        if [ -n "$checked" ] && [ $(($(date +%s) - checked)) -lt "$AUTH_TTL" ]; then
+            return 0
+        fi
+    fi
+    traced "$AUTH_TIMEOUT" gh auth status > /dev/null || return 1
+    mkdir -p "$(dirname "$AUTH_CACHE")"
+    printf '{"ok": true, "checked_at": %s}' "$(date +%s)" > "$AUTH_CACHE"
+}
+
 # Print usage if no arguments
 if [ -z "$REPO_NAME" ]; then
     echo "Usage: clone_repo.sh <repo_name> [target_directory]"
@@ -66,14 +175,27 @@ if [ -d "$TARGET_DIR/$REPO_NAME" ]; then
     exit 0
 fi
 
+if ! gh_auth_ok; then
+    echo "Error: GitHub CLI (gh) is not authenticated."
+    echo "Authenticate with: gh auth login"
+    exit 1
+fi
+
 # Clone the repository
 echo "Cloning $ORG/$REPO_NAME to $TARGET_DIR..."
-cd "$TARGET_DIR" && gh repo clone "$ORG/$REPO_NAME"
+cd "$TARGET_DIR" && traced "$CLONE_TIMEOUT" gh repo clone "$ORG/$REPO_NAME"
+STATUS=$?
 
-if [ $? -eq 0 ]; then
+if [ $STATUS -eq 0 ]; then
     echo "Successfully cloned $REPO_NAME"
+elif [ $STATUS -eq $TIMEOUT_EXIT_CODE ]; then
+    echo "Timed out cloning $REPO_NAME after ${CLONE_TIMEOUT}s"
+    echo "Check network access to github.com, or raise CLONE_TIMEOUT"
+    rm -rf "$REPO_NAME"  # partial clone: it would count as present next time
+    exit 1
 else
     echo "Failed to clone $REPO_NAME"
+    rm -rf "$REPO_NAME"
     echo "Make sure you have access to $ORG organization on GitHub"
     exit 1
 fi
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Scenario-aware parallel fetcher for GDPR CMP repositories.
+
+Loads the scenario -> primary/secondary repository mapping from
+references/repo-mapping.md into a registry, then clones the repositories a
+scenario needs: primary repos first (concurrently), secondary repos concurrently
+in the background. Readiness is reported as each repository lands.
+
+The list of valid repositories is read from AVAILABLE_REPOS in clone_repo.sh.
+
+Usage:
+    python fetch_repos.py --list
+    python fetch_repos.py "Consent logic changes"
+    python fetch_repos.py "mobile" --workspace ~/src
+    python fetch_repos.py "Add new vendor category" --detach-secondary
+    python fetch_repos.py "Publication process" --json
+    python fetch_repos.py "mobile" --timing --trace /tmp/setup-trace.jsonl
+"""
+
+import argparse
+import atexit
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import proc_trace  # noqa: E402
+
+SKILL_DIR = Path(__file__).resolve().parent.parent
+MAPPING_PATH = SKILL_DIR / "references" / "repo-mapping.md"
+CLONE_SCRIPT = SKILL_DIR / "scripts" / "clone_repo.sh"
+ORG = "Ringier-Axel-Springer-PL"
+
+BACKTICKED = re.compile(r"`([^`]+)`")
+TABLE_ROW = re.compile(r"^\|(.+)\|\s*$")
+SCENARIO_HEADING = re.compile(r'^###\s+Scenario:\s*"?(.+?)"?\s*$')
+SCENARIO_STEP = re.compile(r"^\d+\.\s+\*\*(\w[\w ]*)\*\*:?\s*(.*)$")
+
+
+# === Registry ===
+
+def load_available_repos(script: Path = CLONE_SCRIPT) -> List[str]:
+    """Repository names from the AVAILABLE_REPOS array in clone_repo.sh."""
+    match = re.search(r"AVAILABLE_REPOS=\((.*?)\)", script.read_text(), re.S)
+    if not match:
+        return []
+    return re.findall(r'"([^"]+)"', match.group(1))
+
+
+def load_registry(mapping: Path = MAPPING_PATH, available: Optional[List[str]] = None) -> Dict[str, dict]:
+    """Parse repo-mapping.md into {scenario: {primary: [...], secondary: [...]}}.
+
+    Reads the "Quick Reference" table and the "Scenario: ..." sections. In the
+    sections, "Primary" steps are primary; every other step mentioning a known
+    repository (Secondary, Also, Check, If ...) is secondary.
+    """
+    known = set(available or [])
+    registry: Dict[str, dict] = {}
+    lines = mapping.read_text().splitlines()
+
+    def repos_in(text: str) -> List[str]:
+        return [r for r in BACKTICKED.findall(text) if not known or r in known]
+
+    in_quick_reference = False
+    scenario = None
+    for line in lines:
+        if line.startswith("## "):
+            in_quick_reference = False
+            scenario = None
+        if line.strip() == "## Quick Reference":
+            in_quick_reference = True
+            continue
+
+        if in_quick_reference:
+            row = TABLE_ROW.match(line.strip())
+            if not row:
+                continue
+            cells = [c.strip() for c in row.group(1).split("|")]
+            if len(cells) < 3 or cells[0] in ("Scenario", "") or set(cells[0]) <= set("-: "):
+                continue
+            registry[cells[0]] = {"primary": repos_in(cells[1]), "secondary": repos_in(cells[2])}
+            continue
+
+        heading = SCENARIO_HEADING.match(line.strip())
+        if heading:
+            scenario = heading.group(1)
+            registry[scenario] = {"primary": [], "secondary": []}
+            continue
+        if scenario:
+            step = SCENARIO_STEP.match(line.strip())
+            if step:
+                kind = "primary" if step.group(1).lower() == "primary" else "secondary"
+                entry = registry[scenario]
+                for repo in repos_in(step.group(2)):
+                    if repo not in entry["primary"] and repo not in entry["secondary"]:
+                        entry[kind].append(repo)
+
+    return registry
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def match_scenario(query: str, registry: Dict[str, dict]) -> Optional[str]:
+    """Find a scenario by exact name, substring, or best word overlap."""
+    lowered = query.strip().lower()
+    for name in registry:
+        if name.lower() == lowered:
+            return name
+    for name in registry:
+        if lowered in name.lower():
+            return name
+    query_words = _words(query)
+    scored = sorted(
+        ((len(query_words & _words(name)), name) for name in registry),
+        reverse=True,
+    )
+    if scored and scored[0][0] > 0:
+        return scored[0][1]
+    return None
+
+
+# === Cloning ===
+
+def repo_exists(workspace: Path, repo: str) -> bool:
+    """Check if repository exists in workspace."""
+    path = workspace / repo
+    return path.is_dir() and (path / ".git").is_dir()
+
+
+def check_gh_cli() -> bool:
+    """Check if GitHub CLI is installed and authenticated (success is cached briefly)."""
+    try:
+        return proc_trace.gh_auth_ok()
+    except FileNotFoundError:
+        return False
+
+
+def clone(workspace: Path, repo: str) -> dict:
+    """Clone one repository (no-op if already present); a failed clone leaves no directory."""
+    start = time.monotonic()
+    if repo_exists(workspace, repo):
+        return {"repo": repo, "status": "present", "seconds": 0.0}
+    target = workspace / repo
+    created = not target.exists()
+    result = proc_trace.run(
+        ["gh", "repo", "clone", f"{ORG}/{repo}", str(target), "--", "--quiet"],
+        timeout=proc_trace.CLONE_TIMEOUT,
+    )
+    status = "cloned" if result.returncode == 0 else "failed"
+    if status == "failed" and created:
+        # A half-finished clone already has .git and would pass repo_exists()
+        shutil.rmtree(target, ignore_errors=True)
+    entry = {"repo": repo, "status": status, "seconds": round(time.monotonic() - start, 1)}
+    if result.returncode == proc_trace.TIMEOUT_EXIT_CODE:
+        entry["error"] = f"timed out after {proc_trace.CLONE_TIMEOUT}s"
+    elif status == "failed":
+        entry["error"] = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "gh repo clone failed"
+    return entry
+
+
+def spawn_detached(workspace: Path, repo: str) -> dict:
+    """Start a clone that outlives this process; output goes to <workspace>/.<repo>.clone.log.
+
+    The clone runs under `proc_trace.py run`, so it gets the clone timeout, its
+    span lands in the trace file (if any) once it finishes, and a failed clone
+    leaves no directory behind.
+    """
+    if repo_exists(workspace, repo):
+        return {"repo": repo, "status": "present", "seconds": 0.0}
+    target = str(workspace / repo)
+    log = open(workspace / f".{repo}.clone.log", "wb")
+    subprocess.Popen(
+        [sys.executable, str(Path(proc_trace.__file__).resolve()), "run",
+         "--timeout", str(proc_trace.CLONE_TIMEOUT), "--cleanup", target,
+         "--", "gh", "repo", "clone", f"{ORG}/{repo}", target],
+        stdin=subprocess.DEVNULL,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        start_new_session=True,
+    )
+    log.close()
+    return {"repo": repo, "status": "cloning", "seconds": 0.0}
+
+
+class Reporter:
+    """Print readiness lines as repos land (thread-safe), or collect them for JSON."""
+
+    LABELS = {"present": "[OK]", "cloned": "[CLONED]", "failed": "[FAILED]", "cloning": "[BACKGROUND]"}
+
+    def __init__(self, quiet: bool):
+        self.quiet = quiet
+        self.lock = threading.Lock()
+        self.results: List[dict] = []
+
+    def __call__(self, tier: str, entry: dict) -> None:
+        entry = dict(entry, tier=tier)
+        with self.lock:
+            self.results.append(entry)
+            if self.quiet:
+                return
+            line = f"{self.LABELS[entry['status']]} {entry['repo']} ({tier}"
+            line += f", {entry['seconds']}s)" if entry["status"] == "cloned" else ")"
+            if entry.get("error"):
+                line += f" - {entry['error']}"
+            print(line, flush=True)
+
+
+def fetch(workspace: Path, primary: List[str], secondary: List[str], workers: int,
+          detach_secondary: bool, report: Reporter) -> None:
+    """Clone primary repos first; secondary repos start as soon as workers free up."""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        primary_futures = [pool.submit(clone, workspace, repo) for repo in primary]
+        secondary_futures = []
+        if not detach_secondary:
+            # Queued behind primaries; they only run on spare workers.
+            secondary_futures = [pool.submit(clone, workspace, repo) for repo in secondary]
+
+        for future in as_completed(primary_futures):
+            report("primary", future.result())
+        if not report.quiet and primary:
+            print("Primary repositories done.", flush=True)
+
+        if detach_secondary:
+            for repo in secondary:
+                report("secondary", spawn_detached(workspace, repo))
+        for future in as_completed(secondary_futures):
+            report("secondary", future.result())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Clone the GDPR CMP repositories a scenario needs, in parallel"
+    )
+    parser.add_argument("scenario", nargs="?", help="Scenario name or keywords (see --list)")
+    parser.add_argument(
+        "--workspace",
+        type=str,
+        default=os.getcwd(),
+        help="Target directory (default: current directory)",
+    )
+    parser.add_argument("--list", action="store_true", help="List scenarios and exit")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent clones (default: 4)")
+    parser.add_argument(
+        "--detach-secondary",
+        action="store_true",
+        help="Return after primary repos; secondary clones continue in the background",
+    )
+    parser.add_argument("--primary-only", action="store_true", help="Skip secondary repos")
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Print a timing summary of gh calls to stderr when done",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help=f"Append a span per gh call to FILE (JSON lines, same as ${proc_trace.TRACE_ENV})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON for programmatic use",
+    )
+    args = parser.parse_args()
+
+    if args.trace:
+        os.environ[proc_trace.TRACE_ENV] = str(Path(args.trace).resolve())
+    if args.timing:
+        atexit.register(proc_trace.print_summary, proc_trace.SPANS, sys.stderr)
+
+    registry = load_registry(MAPPING_PATH, load_available_repos())
+
+    if args.list or not args.scenario:
+        if args.json_output:
+            print(json.dumps(registry, indent=2))
+            return 0
+        print("Scenarios:")
+        for name, entry in registry.items():
+            secondary = ", ".join(entry["secondary"]) or "-"
+            print(f"  {name}: {', '.join(entry['primary']) or '-'} (secondary: {secondary})")
+        return 0 if args.list else 1
+
+    scenario = match_scenario(args.scenario, registry)
+    if scenario is None:
+        print(f"Error: no scenario matches '{args.scenario}'. Use --list.", file=sys.stderr)
+        return 1
+
+    workspace = Path(args.workspace).expanduser().resolve()
+    workspace.mkdir(parents=True, exist_ok=True)
+    primary = registry[scenario]["primary"]
+    secondary = [] if args.primary_only else registry[scenario]["secondary"]
+
+    missing = [r for r in primary + secondary if not repo_exists(workspace, r)]
+    if missing and not check_gh_cli():
+        print("Error: GitHub CLI (gh) is not installed or not authenticated.", file=sys.stderr)
+        print("Install it with: brew install gh", file=sys.stderr)
+        print("Then authenticate with: gh auth login", file=sys.stderr)
+        return 1
+
+    report = Reporter(quiet=args.json_output)
+    if not args.json_output:
+        print(f"Scenario: {scenario}")
+        print(f"Workspace: {workspace}\n")
+    fetch(workspace, primary, secondary, args.workers, args.detach_secondary, report)
+
+    failed = [r for r in report.results if r["status"] == "failed"]
+    if args.json_output:
+        print(json.dumps({
+            "scenario": scenario,
+            "workspace": str(workspace),
+            "primary": primary,
+            "secondary": secondary,
+            "results": report.results,
+        }, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
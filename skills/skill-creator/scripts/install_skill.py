@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Install skills from a bundle (see pack_skill.py) via a content-addressed store.
+
+File contents are unpacked once into a local store keyed by SHA-256
+(~/.claude/skill-store by default) and copied into the skill directories
+(reflinked where the filesystem supports it, so copies share disk blocks).
+--mode hardlink/symlink share one store object between checkouts instead; those
+files must never be edited in place. Re-installing or upgrading only touches files
+whose content changed, verified by SHA-256 on every run.
+
+Usage:
+    python install_skill.py <bundle.skb> --scope <personal|project> [--skill <name>]
+    python install_skill.py <bundle.skb> --path <skills-dir> [--path <skills-dir> ...]
+
+Examples:
+    python install_skill.py claude-toolkit.skb --scope personal
+    python install_skill.py claude-toolkit.skb --scope project --skill adplatform-guardian
+    python install_skill.py claude-toolkit.skb --path ~/src/repo-a/.claude/skills --path ~/src/repo-b/.claude/skills
+"""
+
+import argparse
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+from pathlib import Path, PurePosixPath
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from init_skill import get_skill_path  # noqa: E402
+from pack_skill import Bundle  # noqa: E402
+
+DEFAULT_STORE = Path.home() / '.claude' / 'skill-store'
+MANIFEST_NAME = '.skill-manifest.json'
+
+HEX_DIGITS = set('0123456789abcdef')
+
+# Linux ioctl that clones a file's extents copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def safe_relative_path(path: str) -> str:
+    """Validate a bundle file path: relative, no '..' segments. Raises ValueError."""
+    pure = PurePosixPath(path)
+    if not path or path == MANIFEST_NAME or '\\' in path or pure.is_absolute() or ':' in pure.parts[0] \
+            or any(part in ('', '.', '..') for part in path.split('/')):
+        raise ValueError(f"unsafe path in bundle: {path!r}")
+    return path
+
+
+def safe_skill_name(name: str) -> str:
+    """Validate a bundle skill name: a single directory name. Raises ValueError."""
+    if not name or name in ('.', '..') or '/' in name or '\\' in name or ':' in name:
+        raise ValueError(f"unsafe skill name in bundle: {name!r}")
+    return name
+
+
+class ContentStore:
+    """Read-only objects addressed by SHA-256 (plus an executable variant)."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root).expanduser()
+        self.written = 0
+        self.reused = 0
+        self.repaired = 0
+        self._verified = set()
+
+    def object_path(self, digest: str, executable: bool) -> Path:
+        if len(digest) != 64 or not set(digest) <= HEX_DIGITS:
+            raise ValueError(f"invalid digest in bundle: {digest[:80]!r}")
+        suffix = '.x' if executable else ''
+        return self.root / 'objects' / digest[:2] / f"{digest[2:]}{suffix}"
+
+    def ensure(self, bundle: Bundle, digest: str, executable: bool) -> Path:
+        """Store a blob from the bundle unless an intact copy is already present."""
+        path = self.object_path(digest, executable)
+        if path in self._verified:
+            self.reused += 1
+            return path
+        if path.exists():
+            if file_sha256(path) == digest:
+                self._verified.add(path)
+                self.reused += 1
+                return path
+            self.repaired += 1  # modified through a link: rewrite it
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f'.tmp{os.getpid()}')
+        tmp.write_bytes(bundle.read_blob(digest))
+        tmp.chmod(0o555 if executable else 0o444)
+        os.replace(tmp, path)
+        self._verified.add(path)
+        self.written += 1
+        return path
+
+
+def clone_file(source: Path, target: Path) -> bool:
+    """Reflink source to target where the filesystem supports it."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def link_file(source: Path, target: Path, mode: str) -> str:
+    """Place a store object at target. Returns the method actually used."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.is_symlink() or target.exists():
+        target.unlink()
+    if mode == 'hardlink':
+        try:
+            os.link(source, target)
+            return 'hardlink'
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            mode = 'symlink'  # store on another filesystem
+    if mode == 'symlink':
+        target.symlink_to(source)
+        return 'symlink'
+    method = 'reflink' if clone_file(source, target) else 'copy'
+    if method == 'copy':
+        shutil.copyfile(source, target)
+    target.chmod(0o755 if os.access(source, os.X_OK) else 0o644)
+    return method
+
+
+def is_installed(target: Path, source: Path, digest: str, mode: str) -> bool:
+    """Whether target is already placed as `mode` and its content still matches digest."""
+    try:
+        if target.is_symlink():
+            return mode == 'symlink' and Path(os.readlink(target)) == source
+        if mode == 'symlink' or (mode == 'hardlink') != os.path.samefile(target, source):
+            return False
+        return file_sha256(target) == digest
+    except OSError:
+        return False
+
+
+def install_skill(bundle: Bundle, skill: dict, skill_path: Path, store: ContentStore,
+                  mode: str, force: bool) -> dict:
+    """Install or upgrade one skill directory from the bundle."""
+    manifest_path = skill_path / MANIFEST_NAME
+    previous: dict = {}
+    if manifest_path.exists():
+        previous = json.loads(manifest_path.read_text()).get('files', {})
+    elif skill_path.exists() and any(skill_path.iterdir()) and not force:
+        raise FileExistsError(
+            f"{skill_path} exists and was not installed from a bundle (use --force to replace)"
+        )
+
+    # Reject the whole skill before writing anything if a path could escape it
+    for entry in skill['files']:
+        safe_relative_path(entry['path'])
+
+    stats = {'installed': 0, 'unchanged': 0, 'removed': 0}
+    current = {}
+    for entry in skill['files']:
+        source = store.ensure(bundle, entry['sha256'], entry['executable'])
+        target = skill_path / entry['path']
+        current[entry['path']] = entry['sha256']
+        if previous.get(entry['path']) == entry['sha256'] and is_installed(target, source, entry['sha256'], mode):
+            stats['unchanged'] += 1
+            continue
+        link_file(source, target, mode)
+        stats['installed'] += 1
+
+    # Drop files that disappeared from the skill since the last install
+    for rel_path in set(previous) - set(current):
+        target = skill_path / safe_relative_path(rel_path)
+        if target.is_symlink() or target.exists():
+            target.unlink()
+            stats['removed'] += 1
+
+    manifest_path.write_text(json.dumps({
+        'skill': skill['name'],
+        'bundle': str(bundle.path),
+        'bundle_created': bundle.index['created'],
+        'validation': skill['validation'],
+        'files': current,
+    }, indent=2, sort_keys=True))
+    return stats
+
+
+def select_skills(index: dict, names: Optional[List[str]]) -> List[dict]:
+    """Skills from the bundle, optionally filtered by name."""
+    if not names:
+        return index['skills']
+    by_name = {s['name']: s for s in index['skills']}
+    missing = [n for n in names if n not in by_name]
+    if missing:
+        raise KeyError(f"Not in bundle: {', '.join(missing)} (available: {', '.join(by_name)})")
+    return [by_name[n] for n in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Install Claude Code skills from a bundle",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s claude-toolkit.skb --scope personal
+  %(prog)s claude-toolkit.skb --scope project --skill adplatform-guardian
+  %(prog)s claude-toolkit.skb --path ~/src/a/.claude/skills --path ~/src/b/.claude/skills
+        """
+    )
+    parser.add_argument(
+        'bundle',
+        help="Bundle file created by pack_skill.py"
+    )
+    parser.add_argument(
+        '--scope',
+        choices=['personal', 'project'],
+        help="'personal' (~/.claude/skills/) or 'project' (./.claude/skills/)"
+    )
+    parser.add_argument(
+        '--path',
+        action='append',
+        help="Skills directory to install into (repeatable, overrides --scope)"
+    )
+    parser.add_argument(
+        '--skill',
+        action='append',
+        help="Install only this skill (repeatable, default: all skills in the bundle)"
+    )
+    parser.add_argument(
+        '--store',
+        default=str(DEFAULT_STORE),
+        help=f"Content-addressed store location (default: {DEFAULT_STORE})"
+    )
+    parser.add_argument(
+        '--mode',
+        choices=['copy', 'hardlink', 'symlink'],
+        default='copy',
+        help="How files are placed from the store (default: copy, reflinked where supported; "
+             "hardlink/symlink share the store object, so never edit those files)"
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help="Replace existing skill directories not installed from a bundle"
+    )
+
+    args = parser.parse_args()
+
+    if not args.scope and not args.path:
+        parser.error("one of --scope or --path is required")
+
+    try:
+        bundle = Bundle(Path(args.bundle))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    store = ContentStore(Path(args.store))
+    destinations = args.path or [None]
+    failures = 0
+
+    with bundle:
+        try:
+            skills = select_skills(bundle.index, args.skill)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}", file=sys.stderr)
+            sys.exit(1)
+
+        for destination in destinations:
+            for skill in skills:
+                try:
+                    name = safe_skill_name(skill['name'])
+                    skill_path = get_skill_path(name, args.scope or 'project', destination)
+                    stats = install_skill(bundle, skill, skill_path, store, args.mode, args.force)
+                except (OSError, ValueError) as e:
+                    print(f"✗ {skill['name']}: {e}", file=sys.stderr)
+                    failures += 1
+                    continue
+                warning = "" if skill['validation']['valid'] else " (⚠ packed with validation errors)"
+                print(f"✓ {skill['name']} → {skill_path}: {stats['installed']} installed, "
+                      f"{stats['unchanged']} unchanged, {stats['removed']} removed{warning}")
+
+    print()
+    repaired = f" ({store.repaired} modified object(s) rewritten)" if store.repaired else ""
+    print(f"Store {store.root}: {store.written} object(s) written, {store.reused} reused{repaired}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
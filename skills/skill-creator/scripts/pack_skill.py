@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Pack one or more Claude Code skills into a single content-addressed bundle file.
+
+The bundle holds an index (skills, their files with SHA-256 and mode, and the
+SkillValidator result for each skill) followed by zlib-compressed blobs. Identical
+files are stored once, across all skills in the bundle. Install with
+install_skill.py.
+
+Usage:
+    python pack_skill.py <skill-path> [<skill-path> ...] -o <bundle.skb>
+    python pack_skill.py ./skills -o toolkit.skb      # every skill under ./skills
+    python pack_skill.py --list toolkit.skb
+
+Examples:
+    python pack_skill.py ~/.claude/skills/my-skill -o my-skill.skb
+    python pack_skill.py skills/ -o claude-toolkit.skb --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from validate_skill import SkillValidator  # noqa: E402
+
+MAGIC = b"SKILLBUNDLE\x00"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">12sHQ")  # magic, format version, index length
+
+# Never packed
+EXCLUDED_NAMES = {"__pycache__", ".DS_Store", ".git", ".skill-manifest.json"}
+EXCLUDED_SUFFIXES = {".pyc", ".pyo"}
+
+
+def find_skills(paths: List[str]) -> List[Path]:
+    """Expand arguments to skill directories (a dir with SKILL.md, or a dir of such dirs)."""
+    skills = []
+    for raw in paths:
+        path = Path(raw).expanduser().resolve()
+        if (path / 'SKILL.md').is_file():
+            skills.append(path)
+        elif path.is_dir():
+            skills.extend(sorted(p.parent for p in path.glob('*/SKILL.md')))
+    return skills
+
+
+def iter_skill_files(skill_path: Path):
+    """Yield files of a skill in a stable order, skipping caches and VCS data."""
+    for root, dirs, files in os.walk(skill_path):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_NAMES)
+        for name in sorted(files):
+            if name in EXCLUDED_NAMES or Path(name).suffix in EXCLUDED_SUFFIXES:
+                continue
+            yield Path(root) / name
+
+
+def validation_metadata(skill_path: Path) -> dict:
+    """Run SkillValidator and keep its findings in the bundle index."""
+    validator = SkillValidator(skill_path)
+    is_valid = validator.validate()
+    return {
+        'valid': is_valid,
+        'name': validator.frontmatter.get('name', skill_path.name),
+        'description': validator.frontmatter.get('description', ''),
+        'errors': [
+            {'level': e.level, 'message': e.message}
+            for e in validator.errors
+        ],
+    }
+
+
+def pack(skill_paths: List[Path], output: Path, force: bool = False) -> dict:
+    """Write a bundle containing the given skills. Returns the index."""
+    blobs: Dict[str, bytes] = {}
+    skills = []
+
+    for skill_path in skill_paths:
+        validation = validation_metadata(skill_path)
+        if not validation['valid'] and not force:
+            errors = [e['message'] for e in validation['errors'] if e['level'] == 'error']
+            raise ValueError(f"Skill '{skill_path.name}' failed validation: {'; '.join(errors)}")
+
+        files = []
+        for file_path in iter_skill_files(skill_path):
+            data = file_path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if digest not in blobs:
+                blobs[digest] = zlib.compress(data, 9)
+            files.append({
+                'path': file_path.relative_to(skill_path).as_posix(),
+                'sha256': digest,
+                'size': len(data),
+                'executable': bool(file_path.stat().st_mode & 0o111),
+            })
+        skills.append({'name': skill_path.name, 'validation': validation, 'files': files})
+
+    offset = 0
+    blob_index = {}
+    for digest, compressed in blobs.items():
+        blob_index[digest] = {'offset': offset, 'length': len(compressed)}
+        offset += len(compressed)
+
+    index = {
+        'format': FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'skills': skills,
+        'blobs': blob_index,
+    }
+    index_bytes = json.dumps(index, sort_keys=True).encode()
+
+    tmp = output.with_name(output.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for compressed in blobs.values():
+            f.write(compressed)
+    os.replace(tmp, output)
+    return index
+
+
+class Bundle:
+    """Read access to a bundle: the index, and blobs by digest (verified on read)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        header = self._file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"Not a skill bundle: {self.path}")
+        magic, version, index_length = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"Not a skill bundle: {self.path}")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Bundle format {version} is newer than supported ({FORMAT_VERSION})")
+        self.index = json.loads(self._file.read(index_length))
+        self.data_offset = HEADER.size + index_length
+
+    def read_blob(self, digest: str) -> bytes:
+        entry = self.index['blobs'][digest]
+        self._file.seek(self.data_offset + entry['offset'])
+        data = zlib.decompress(self._file.read(entry['length']))
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupt blob {digest[:12]} in {self.path}")
+        return data
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def print_index(index: dict) -> None:
+    """Print bundle contents."""
+    total_files = sum(len(s['files']) for s in index['skills'])
+    print(f"Bundle format {index['format']}, created {index['created']}")
+    print(f"{len(index['skills'])} skill(s), {total_files} file(s), {len(index['blobs'])} unique blob(s)\n")
+    for skill in index['skills']:
+        validation = skill['validation']
+        errors = sum(1 for e in validation['errors'] if e['level'] == 'error')
+        warnings = sum(1 for e in validation['errors'] if e['level'] == 'warning')
+        icon = "✓" if validation['valid'] else "✗"
+        print(f"{icon} {skill['name']}: {len(skill['files'])} file(s), "
+              f"{errors} error(s), {warnings} warning(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack Claude Code skills into a single bundle file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s ~/.claude/skills/my-skill -o my-skill.skb
+  %(prog)s skills/ -o claude-toolkit.skb
+  %(prog)s --list claude-toolkit.skb
+        """
+    )
+    parser.add_argument(
+        'paths',
+        nargs='*',
+        help="Skill directories, or directories containing skills"
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help="Bundle file to write"
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help="Pack skills even if validation reports errors"
+    )
+    parser.add_argument(
+        '--list',
+        metavar='BUNDLE',
+        help="Show the contents of an existing bundle"
+    )
+
+    args = parser.parse_args()
+
+    if args.list:
+        try:
+            with Bundle(Path(args.list)) as bundle:
+                print_index(bundle.index)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if not args.paths or not args.output:
+        parser.error("skill paths and --output are required")
+
+    skill_paths = find_skills(args.paths)
+    if not skill_paths:
+        print("Error: no skills (directories with SKILL.md) found", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        index = pack(skill_paths, Path(args.output), force=args.force)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        print("Fix the skill or use --force", file=sys.stderr)
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error writing bundle: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    size = Path(args.output).stat().st_size
+    print(f"✓ Packed {len(index['skills'])} skill(s) into {args.output} ({size} bytes)")
+    print_index(index)
+
+
+if __name__ == "__main__":
+    main()
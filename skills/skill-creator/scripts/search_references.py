@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Search the reference documents of all installed skills (BM25 over sections).
+
+Splits every skill's references/*.md into heading-level sections and keeps a
+persistent index of their term counts. Each run re-chunks only files whose
+stat/content changed, then ranks sections with BM25 and prints file:line
+anchors, so only the matching section needs to be read.
+
+Usage:
+    python search_references.py "<query>" [-k 5] [--show]
+    python search_references.py "<query>" --scope project --path ./skills
+    python search_references.py --update
+
+Examples:
+    python search_references.py "druid dimension for actgid"
+    python search_references.py "cmp_coordinator changelog version bump" --show
+    python search_references.py "consent mobile flow" --json
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from pack_skill import find_skills  # noqa: E402
+
+DEFAULT_INDEX = Path.home() / '.cache' / 'claude-toolkit' / 'reference_index.json'
+INDEX_VERSION = 1
+
+SCOPE_DIRS = {
+    'personal': Path.home() / '.claude' / 'skills',
+    'project': Path.cwd() / '.claude' / 'skills',
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Heading words count this many times in the section's term counts
+HEADING_WEIGHT = 3
+
+HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+FENCE = re.compile(r'^\s*(```|~~~)')
+TOKEN = re.compile(r'[a-z0-9][a-z0-9_.\-]*[a-z0-9]|[a-z0-9]')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'in', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'which',
+    'with', 'do', 'does', 'i', 'we', 'you',
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms; compound identifiers also yield their parts (adp_conversions -> adp, conversions)."""
+    terms = []
+    for token in TOKEN.findall(text.lower()):
+        if token not in STOPWORDS:
+            terms.append(token)
+        parts = [p for p in re.split(r'[_.\-]', token) if p]
+        if len(parts) > 1:
+            terms.extend(p for p in parts if p not in STOPWORDS)
+    return terms
+
+
+def chunk_markdown(text: str, fallback_title: str) -> List[dict]:
+    """Split markdown into sections at headings (ignoring headings inside code fences)."""
+    chunks: List[dict] = []
+    trail: List[Tuple[int, str]] = []
+    current = {'title': fallback_title, 'breadcrumb': fallback_title, 'level': 0, 'start': 1, 'lines': []}
+    in_fence = False
+
+    def close(end: int) -> None:
+        body = '\n'.join(current['lines'])
+        if body.strip():  # heading-only containers are covered by their subsections' breadcrumbs
+            counts: Dict[str, int] = {}
+            for term in tokenize(body):
+                counts[term] = counts.get(term, 0) + 1
+            for term in tokenize(current['title']):
+                counts[term] = counts.get(term, 0) + HEADING_WEIGHT
+            chunks.append({
+                'title': current['title'],
+                'breadcrumb': current['breadcrumb'],
+                'level': current['level'],
+                'start': current['start'],
+                'end': end,
+                'length': sum(counts.values()),
+                'tf': counts,
+            })
+
+    for number, line in enumerate(text.splitlines(), start=1):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        heading = None if in_fence else HEADING.match(line)
+        if not heading:
+            current['lines'].append(line)
+            continue
+        close(number - 1)
+        level, title = len(heading.group(1)), heading.group(2)
+        trail = [(lvl, t) for lvl, t in trail if lvl < level] + [(level, title)]
+        current = {
+            'title': title,
+            'breadcrumb': ' > '.join(t for _, t in trail),
+            'level': level,
+            'start': number,
+            'lines': [],
+        }
+    close(len(text.splitlines()))
+    return chunks
+
+
+class ReferenceIndex:
+    """Persistent per-file section index with BM25 ranking."""
+
+    def __init__(self, index_path: Path):
+        self.index_path = index_path
+        self.files: Dict[str, dict] = {}
+        self.scanned: Optional[Dict[str, None]] = None  # keys seen by the last update(), in scan order
+        self.stats = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text())
+            if data.get('version') == INDEX_VERSION:
+                self.files = data['files']
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+
+    def save(self) -> None:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'version': INDEX_VERSION, 'files': self.files}))
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            print(f"Warning: could not write index {self.index_path}: {e}", file=sys.stderr)
+
+    def update(self, skill_paths: List[Path], roots: Optional[List[Path]] = None) -> bool:
+        """Re-chunk changed reference files and drop vanished ones. Returns True if the index changed.
+
+        Only entries under the scanned roots (and skills) are dropped, so other
+        scopes sharing the index file keep theirs.
+        """
+        seen: Dict[str, None] = {}
+        dirty = False
+        scanned_dirs = [r.expanduser().resolve() for r in roots or []]
+        for skill_path in skill_paths:
+            references = skill_path / 'references'
+            scanned_dirs.append(references.resolve())
+            if not references.is_dir():
+                continue
+            for path in sorted(references.rglob('*.md')):
+                key = str(path.resolve())
+                if key in seen:
+                    continue
+                seen[key] = None
+                st = path.stat()
+                stat_key = [st.st_mtime_ns, st.st_size]
+                entry = self.files.get(key)
+                if entry and entry['stat'] == stat_key:
+                    self.stats['unchanged'] += 1
+                    continue
+                data = path.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                if entry and entry['sha256'] == digest:
+                    entry['stat'] = stat_key
+                    self.stats['unchanged'] += 1
+                    dirty = True
+                    continue
+                self.files[key] = {
+                    'skill': skill_path.name,
+                    'relative': f"{skill_path.name}/{path.relative_to(skill_path).as_posix()}",
+                    'stat': stat_key,
+                    'sha256': digest,
+                    'chunks': chunk_markdown(data.decode('utf-8', errors='replace'), path.stem),
+                }
+                self.stats['indexed'] += 1
+
+        for key in [k for k in self.files if k not in seen]:
+            if any(Path(key).is_relative_to(d) for d in scanned_dirs):
+                del self.files[key]
+                self.stats['removed'] += 1
+        self.scanned = seen
+        return dirty or bool(self.stats['indexed'] or self.stats['removed'])
+
+    def entries(self) -> List[Tuple[str, dict]]:
+        """Files in scope (the last update's scan, else all), one per content sha256.
+
+        A skill installed in several scopes is only searched once, under the
+        first path scanned.
+        """
+        keys = self.scanned if self.scanned is not None else self.files
+        unique: Dict[str, Tuple[str, dict]] = {}
+        for key in keys:
+            entry = self.files.get(key)
+            if entry:
+                unique.setdefault(entry['sha256'], (key, entry))
+        return list(unique.values())
+
+    def search(self, query: str, limit: int = 5, skill: Optional[str] = None) -> List[dict]:
+        """Top sections for the query by BM25 score."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        chunks = [
+            (key, entry, chunk)
+            for key, entry in self.entries()
+            if skill is None or entry['skill'] == skill
+            for chunk in entry['chunks']
+        ]
+        if not chunks:
+            return []
+        total = len(chunks)
+        avg_length = sum(c['length'] for _, _, c in chunks) / total or 1.0
+        df = {t: sum(1 for _, _, c in chunks if t in c['tf']) for t in terms}
+        idf = {t: math.log((total - n + 0.5) / (n + 0.5) + 1) for t, n in df.items()}
+
+        scored = []
+        for key, entry, chunk in chunks:
+            score = 0.0
+            norm = K1 * (1 - B + B * chunk['length'] / avg_length)
+            for term in terms:
+                tf = chunk['tf'].get(term)
+                if tf:
+                    score += idf[term] * tf * (K1 + 1) / (tf + norm)
+            if score > 0:
+                scored.append((score, key, entry, chunk))
+        scored.sort(key=lambda s: s[0], reverse=True)
+
+        return [
+            {
+                'score': round(score, 3),
+                'skill': entry['skill'],
+                'file': key,
+                'relative': entry['relative'],
+                'line': chunk['start'],
+                'end_line': chunk['end'],
+                'section': chunk['breadcrumb'],
+                'matched': [t for t in terms if t in chunk['tf']],
+            }
+            for score, key, entry, chunk in scored[:limit]
+        ]
+
+
+def section_lines(result: dict) -> List[str]:
+    """Lines of a result's section from the reference file."""
+    try:
+        lines = Path(result['file']).read_text(errors='replace').splitlines()
+    except OSError:
+        return []
+    return lines[result['line'] - 1:result['end_line']]
+
+
+def best_line(lines: List[str], terms: List[str]) -> str:
+    """Body line with the most query terms, for a one-line preview."""
+    best, best_hits = '', 0
+    for line in lines[1:]:
+        tokens = set(tokenize(line))
+        hits = sum(1 for t in terms if t in tokens)
+        if hits > best_hits:
+            best, best_hits = line.strip(), hits
+    return best[:160]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search the reference documents of installed Claude Code skills",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s "druid dimension for actgid"
+  %(prog)s "changelog version bump" --show -k 3
+  %(prog)s "consent flow" --path ./skills --json
+        """
+    )
+    parser.add_argument(
+        'query',
+        nargs='*',
+        help="Search terms"
+    )
+    parser.add_argument(
+        '-k', '--limit',
+        type=int,
+        default=5,
+        help="Number of sections to return (default: 5)"
+    )
+    parser.add_argument(
+        '--scope',
+        choices=['personal', 'project', 'all'],
+        default='all',
+        help="Which installed skills to index (default: all)"
+    )
+    parser.add_argument(
+        '--path',
+        action='append',
+        help="Additional skill directory or directory of skills (repeatable)"
+    )
+    parser.add_argument(
+        '--skill',
+        help="Only search this skill's references"
+    )
+    parser.add_argument(
+        '--show',
+        action='store_true',
+        help="Print the text of each matching section"
+    )
+    parser.add_argument(
+        '--update',
+        action='store_true',
+        help="Only refresh the index and report what changed"
+    )
+    parser.add_argument(
+        '--index',
+        default=str(DEFAULT_INDEX),
+        help=f"Index file (default: {DEFAULT_INDEX})"
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        dest='json_output',
+        help="Output as JSON for programmatic use"
+    )
+
+    args = parser.parse_args()
+
+    if not args.query and not args.update:
+        parser.error("a query is required (or --update)")
+
+    roots = [] if args.scope != 'all' else list(SCOPE_DIRS.values())
+    if args.scope in SCOPE_DIRS:
+        roots.append(SCOPE_DIRS[args.scope])
+    roots.extend(Path(p).expanduser() for p in args.path or [])
+    skill_paths = find_skills([str(r) for r in roots if r.is_dir()])
+
+    index = ReferenceIndex(Path(args.index).expanduser())
+    index.load()
+    if index.update(skill_paths, roots):
+        index.save()
+
+    entries = index.entries()
+    chunk_count = sum(len(e['chunks']) for _, e in entries)
+    if args.update:
+        stats = dict(index.stats, skills=len(skill_paths), files=len(entries), sections=chunk_count)
+        if args.json_output:
+            print(json.dumps(stats, indent=2))
+        else:
+            print(f"✓ {stats['files']} reference file(s), {chunk_count} section(s) from {len(skill_paths)} skill(s)")
+            print(f"  {stats['indexed']} (re)indexed, {stats['unchanged']} unchanged, {stats['removed']} removed")
+        sys.exit(0)
+
+    query = ' '.join(args.query)
+    results = index.search(query, args.limit, args.skill)
+    for result in results:
+        lines = section_lines(result)
+        result['preview'] = best_line(lines, result['matched'])
+        if args.show:
+            result['text'] = '\n'.join(lines)
+
+    if args.json_output:
+        print(json.dumps({'query': query, 'sections': chunk_count, 'results': results}, indent=2))
+        sys.exit(0 if results else 1)
+
+    if not results:
+        print(f"No sections match '{query}' ({chunk_count} section(s) in {len(entries)} file(s))")
+        sys.exit(1)
+
+    for result in results:
+        print(f"{result['file']}:{result['line']}-{result['end_line']}  ({result['score']})")
+        print(f"  {result['section']}")
+        if result['preview']:
+            print(f"  └─ {result['preview']}")
+        if args.show:
+            print()
+            print(result['text'])
+            print()
+
+
+if __name__ == "__main__":
+    main()